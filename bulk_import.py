@@ -0,0 +1,463 @@
+"""Fast bulk DB population from validated sources.
+
+Single implementation shared by the fast_populate_db.py entry point and tools/rebuild_db.py.
+Importing this module has no side effects.
+"""
+
+import functools
+import json
+import math
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from sys import intern
+from typing import Any
+
+from config import get_table_paths
+from reactions_db import (
+    MIGRATION_NAME_INIT,
+    SCHEMA_SQL,
+    TABLE_CATEGORY,
+    canonicalize_source_path,
+    latex_to_canonical,
+)
+from tsv_utils import iter_tsv_rows
+
+# Staged rows are passed to SQLite as JSON arrays; $[n] is the tuple position built by
+# _parse_one. Measurements are attached to the reactions inserted for the same file by
+# matching their per-file index, so reaction ids never have to be guessed.
+INSERT_REACTIONS_JSON_SQL = """
+INSERT INTO reactions(table_no, table_category, buxton_reaction_number, reaction_name,
+  formula_latex, formula_canonical, reactants, products, reactant_species,
+  product_species, notes, source_path)
+SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), json_extract(value, '$[2]'),
+  json_extract(value, '$[3]'), json_extract(value, '$[4]'), json_extract(value, '$[5]'),
+  json_extract(value, '$[6]'), json_extract(value, '$[7]'), json_extract(value, '$[8]'),
+  json_extract(value, '$[9]'), json_extract(value, '$[10]'), json_extract(value, '$[11]')
+FROM json_each(?)
+ORDER BY key
+"""
+
+INSERT_MEASUREMENTS_JSON_SQL = """
+WITH r AS (
+  SELECT id, row_number() OVER (ORDER BY id) - 1 AS idx
+  FROM reactions
+  WHERE source_path = ? AND id > ?
+)
+INSERT INTO measurements(reaction_id, pH, temperature_C, rate_value, rate_value_num,
+  rate_units, method, conditions, reference_id, source_path, page_info)
+SELECT r.id, json_extract(m.value, '$[1]'), json_extract(m.value, '$[2]'),
+  json_extract(m.value, '$[3]'), json_extract(m.value, '$[4]'), json_extract(m.value, '$[5]'),
+  json_extract(m.value, '$[6]'), json_extract(m.value, '$[7]'), ref.id,
+  json_extract(m.value, '$[9]'), json_extract(m.value, '$[10]')
+FROM json_each(?) AS m
+JOIN r ON r.idx = json_extract(m.value, '$[0]')
+LEFT JOIN references_map AS ref ON ref.buxton_code = json_extract(m.value, '$[8]')
+ORDER BY m.key
+"""
+
+INSERT_REFERENCES_SQL = "INSERT INTO references_map(buxton_code, citation_text, doi) VALUES (?,?,?)"
+
+# Below this many sources the process pool start-up costs more than it saves
+PARALLEL_MIN_SOURCES = 32
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_rate_value_fast(raw: str) -> float | None:
+    """Fast rate value parsing; memoized since a table's rate column repeats heavily.
+
+    Non-finite results ("nan", "-inf", "1e999") are None: they are not representable in the
+    JSON staging blob.
+    """
+    if not raw:
+        return None
+    try:
+        if "^" not in raw:
+            # No exponent: skip the LaTeX rewrite, only spaces need removing
+            num = float(raw.replace(" ", ""))
+        else:
+            s = raw.replace("\\times", "x").replace(" ", "")
+            if "x10^" in s:
+                parts = s.split("x10^", 1)
+                num = float(parts[0]) * (10 ** int(parts[1]))
+            elif "×10^" in s:
+                parts = s.split("×10^", 1)
+                num = float(parts[0]) * (10 ** int(parts[1]))
+            else:
+                num = float(s)
+    except Exception:
+        return None
+    return num if math.isfinite(num) else None
+
+
+@functools.lru_cache(maxsize=8192)
+def _dump_species(species: tuple[str, ...]) -> str:
+    """JSON-encode a species list; the same lists recur across thousands of rows."""
+    return json.dumps(list(species), ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=65536)
+def _canonical_cached(
+    formula_latex: str,
+) -> tuple[str, str, str, tuple[str, ...], tuple[str, ...]]:
+    """Memoized latex_to_canonical; species lists become tuples so results are hashable."""
+    canonical, reactants, products, r_species, p_species = latex_to_canonical(formula_latex)
+    return canonical, reactants, products, tuple(r_species), tuple(p_species)
+
+
+def build_reaction_tuple(
+    tno: int, category: str, row: list[str], src_canon: str, idx: int
+) -> tuple[tuple[Any, ...], tuple[Any, ...]] | None:
+    """Build the staged (reaction, measurement) pair for one TSV row.
+
+    Returns None for rows without a formula. This is the per-row hot path.
+    """
+    if len(row) < 7:
+        row.extend([""] * (7 - len(row)))
+    formula_latex = row[2].strip()
+    if not formula_latex:
+        return None
+    # Highly repetitive columns: share one str object per distinct value
+    method_or_notes = intern(row[5].strip()) or None
+    rate_value = row[4].strip()
+
+    # Same formulas recur across tables (one reaction, several conditions)
+    canonical, reactants, products, r_species, p_species = _canonical_cached(formula_latex)
+    reaction = (
+        tno,
+        category,
+        row[0].strip() or None,
+        row[1].strip() or None,
+        formula_latex,
+        canonical,
+        reactants,
+        products,
+        _dump_species(r_species),
+        _dump_species(p_species),
+        method_or_notes,
+        src_canon,
+    )
+
+    rate_num = parse_rate_value_fast(rate_value) if rate_value else None
+    measurement = (
+        idx,
+        row[3].strip() or None,
+        None,
+        rate_value,
+        rate_num,
+        None,
+        None,
+        method_or_notes,
+        intern(row[6].strip()) or None,
+        src_canon,
+        None,
+    )
+    return reaction, measurement
+
+
+def _parse_one(args: tuple[int, Path]) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+    """Parse a single validated source file without touching SQLite.
+
+    Runs in a worker process. Returns (reactions, measurements) where each measurement
+    starts with the 0-based index of its reaction within this file and carries the raw
+    reference code in the reference_id slot; the driver maps both to global ids.
+    """
+    tno, source_path = args
+    reactions: list[tuple[Any, ...]] = []
+    measurements: list[tuple[Any, ...]] = []
+    # Constant for the whole file; interned so every staged row shares one str object
+    category = intern(TABLE_CATEGORY.get(tno, str(tno)))
+    src_canon = intern(canonicalize_source_path(str(source_path)))
+    # Bind hot callables to locals (LOAD_FAST instead of global/attribute lookups)
+    reactions_append = reactions.append
+    measurements_append = measurements.append
+    _build = build_reaction_tuple
+    try:
+        for row in iter_tsv_rows(source_path):
+            built = _build(tno, category, row, src_canon, len(reactions))
+            if built is None:
+                continue
+            reactions_append(built[0])
+            measurements_append(built[1])
+    except Exception as e:
+        print(f"[FAST] Error processing {source_path}: {e}")
+    return reactions, measurements
+
+
+def _drop_bulk_load_objects(con: sqlite3.Connection) -> list[str]:
+    """Drop non-unique indexes and triggers on reactions/measurements before a bulk load.
+
+    Returns the original CREATE statements so the caller can restore them afterwards.
+    Unique indexes are kept since they enforce constraints during the load.
+    """
+    rows = con.execute(
+        """
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger')
+          AND tbl_name IN ('reactions', 'measurements')
+          AND sql IS NOT NULL
+        """
+    ).fetchall()
+    ddl: list[str] = []
+    for obj_type, name, sql in rows:
+        if obj_type == "index" and "UNIQUE" in sql.upper():
+            continue
+        con.execute(f'DROP {obj_type.upper()} IF EXISTS "{name}"')
+        ddl.append(sql)
+    return ddl
+
+
+def _safe_remove_db_files(db_path: Path, retries: int = 10, backoff_s: float = 0.2) -> None:
+    """Remove SQLite DB file and sidecars (-wal, -shm) with Windows-friendly retries.
+
+    If another process is using the DB, this will retry a few times and then raise
+    a clear error telling the user which process may still be holding the lock.
+    """
+    targets = [
+        db_path,
+        Path(str(db_path) + "-wal"),
+        Path(str(db_path) + "-shm"),
+    ]
+
+    def try_unlink(p: Path) -> None:
+        if not p.exists():
+            return
+        last_err: Exception | None = None
+        for i in range(retries):
+            try:
+                p.unlink()
+                return
+            except PermissionError as e:
+                last_err = e
+                # Exponential-ish backoff: 0.2, 0.4, 0.6, ...
+                time.sleep(backoff_s * (i + 1))
+            except Exception:
+                # Other errors should break immediately
+                raise
+        # If we exhausted retries, raise with context
+        raise PermissionError(
+            f"Could not remove '{p}'. The file appears to be in use by another process. "
+            "Close any apps using the database (e.g., the running server) and try again."
+        ) from last_err
+
+    for t in targets:
+        try_unlink(t)
+
+
+def bulk_import_validated_sources(db_path: Path | None = None, workers: int | None = None) -> None:
+    """Fast bulk import of all validated sources.
+
+    Args:
+        db_path: optional target database path. If None, defaults to reactions.db.
+                 If the file exists, it will be removed along with sidecars before creation.
+        workers: number of parser processes. If None, defaults to os.cpu_count().
+                 Small source lists are always parsed in-process.
+    """
+    print("[FAST] Starting bulk import...")
+
+    # Resolve target DB path
+    db_path = Path("reactions.db") if db_path is None else Path(db_path)
+
+    # Reset target DB completely for clean slate (safe for offline build files)
+    if db_path.exists():
+        _safe_remove_db_files(db_path)
+
+    con = None
+    try:
+        con = sqlite3.connect(str(db_path))
+        con.row_factory = sqlite3.Row
+        # Page size must be set before the first table is created
+        con.execute("PRAGMA page_size = 32768")
+        con.execute("PRAGMA mmap_size = 268435456")  # 256MB memory-mapped reads
+        # Aggressive PRAGMAs for fast offline build
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.execute("PRAGMA locking_mode = EXCLUSIVE")
+        con.execute("PRAGMA temp_store = MEMORY")
+        con.execute("PRAGMA cache_size = -100000")  # ~100MB cache
+        con.execute("PRAGMA foreign_keys = OFF")
+        con.execute("PRAGMA defer_foreign_keys = ON")
+        # Single transaction for entire build
+        con.execute("BEGIN IMMEDIATE")
+
+        # Create schema
+        con.executescript(SCHEMA_SQL)
+        con.execute("INSERT INTO schema_migrations(name) VALUES (?)", (MIGRATION_NAME_INIT,))
+
+        # Collect all validated sources first
+        sources_to_import = []
+        validation_updates = []
+
+        print("[FAST] Collecting validated sources...")
+        for tno in [5, 6, 7, 8, 9]:
+            table_name = f"table{tno}"
+            IMAGE_DIR, PDF_DIR, TSV_DIR, DB_JSON_PATH = get_table_paths(table_name)
+
+            if not DB_JSON_PATH.exists() or not TSV_DIR.is_dir():
+                continue
+
+            try:
+                # One directory read per table instead of two stat() calls per image
+                with os.scandir(TSV_DIR) as it:
+                    names = {e.name for e in it if e.is_file()}
+
+                # Load validation data
+                raw_data = json.loads(DB_JSON_PATH.read_text(encoding="utf-8"))
+                for img, meta in raw_data.items():
+                    if isinstance(meta, bool):
+                        is_valid, by, at = bool(meta), None, None
+                    else:
+                        is_valid = bool(meta.get("validated", False))
+                        by = meta.get("by")
+                        at = meta.get("at")
+
+                    if not is_valid:
+                        continue  # Skip non-validated
+
+                    stem = Path(img).stem
+                    csv_name = f"{stem}.csv"
+                    tsv_name = f"{stem}.tsv"
+                    source_path = (
+                        TSV_DIR / csv_name
+                        if csv_name in names
+                        else (TSV_DIR / tsv_name if tsv_name in names else None)
+                    )
+
+                    if source_path:
+                        sources_to_import.append((tno, source_path))
+                        validation_updates.append(
+                            (canonicalize_source_path(str(source_path)), is_valid, by, at)
+                        )
+
+            except Exception as e:
+                print(f"[FAST] Error loading {DB_JSON_PATH}: {e}")
+
+        print(f"[FAST] Found {len(sources_to_import)} validated sources to import")
+
+        if not sources_to_import:
+            print("[FAST] No sources to import")
+            # Commit schema-only DB and restore runtime settings
+            con.commit()
+            try:
+                con.execute("PRAGMA foreign_keys = ON")
+                con.execute("PRAGMA journal_mode = WAL")
+                con.execute("PRAGMA synchronous = NORMAL")
+            except Exception:
+                pass
+            return
+
+        # Bulk import all TSV/CSV files
+        # Staged per file: (reactions, measurements) as returned by _parse_one
+        staged_files: list[tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]] = []
+        references_data: list[tuple[str, str | None, str | None]] = []
+        seen_refs: set[str] = set()
+        reactions_total = 0
+        measurements_total = 0
+
+        print("[FAST] Processing TSV/CSV files...")
+        total_sources = len(sources_to_import)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        executor = None
+        if workers > 1 and total_sources >= PARALLEL_MIN_SOURCES:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            if executor is not None:
+                parsed = executor.map(_parse_one, sources_to_import, chunksize=16)
+            else:
+                parsed = map(_parse_one, sources_to_import)
+
+            # Collect per-file results in source order so ids match a sequential run
+            staged_append = staged_files.append
+            references_append = references_data.append
+            for i, (file_reactions, file_measurements) in enumerate(parsed):
+                if (i & 127) == 0:
+                    print(f"[FAST] Processing {i}/{total_sources}...")
+                if not file_reactions:
+                    continue
+                staged_append((file_reactions, file_measurements))
+                reactions_total += len(file_reactions)
+                measurements_total += len(file_measurements)
+                for measurement in file_measurements:
+                    reference_code = measurement[8]
+                    if reference_code and reference_code not in seen_refs:
+                        seen_refs.add(reference_code)
+                        references_append((reference_code, None, None))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        print(
+            f"[FAST] Prepared {reactions_total} reactions, {measurements_total} measurements, {len(references_data)} references"
+        )
+
+        # Bulk insert everything
+        print("[FAST] Bulk inserting data...")
+
+        # Secondary indexes and FTS triggers are rebuilt once afterwards instead of
+        # being maintained row by row during the load
+        deferred_ddl = _drop_bulk_load_objects(con)
+        try:
+            # References first so measurements can resolve reference_id by buxton_code
+            if references_data:
+                con.executemany(INSERT_REFERENCES_SQL, references_data)
+
+            # One INSERT ... SELECT per file and table; rows travel as a single JSON blob
+            for file_reactions, file_measurements in staged_files:
+                last_id = con.execute("SELECT COALESCE(MAX(id), 0) FROM reactions").fetchone()[0]
+                con.execute(
+                    INSERT_REACTIONS_JSON_SQL, (json.dumps(file_reactions, ensure_ascii=False),)
+                )
+                con.execute(
+                    INSERT_MEASUREMENTS_JSON_SQL,
+                    (
+                        file_reactions[0][11],
+                        last_id,
+                        json.dumps(file_measurements, ensure_ascii=False),
+                    ),
+                )
+
+            # Bulk update validation flags
+            print("[FAST] Setting validation flags...")
+            for src_canon, _is_valid, by, at in validation_updates:
+                # validation_updates only contains validated=True entries in this fast path
+                con.execute(
+                    "UPDATE reactions SET validated = 1, validated_by = ?, validated_at = ? WHERE source_path = ?",
+                    (by, at, src_canon),
+                )
+        finally:
+            for ddl in deferred_ddl:
+                con.execute(ddl)
+
+        # Populate FTS in one pass; the index is empty on a fresh build so 'rebuild'
+        # (delete-all + re-scan) would only add work
+        print("[FAST] Building FTS index...")
+        con.execute(
+            "INSERT INTO reactions_fts(rowid, reaction_name, formula_canonical, notes) "
+            "SELECT id, reaction_name, formula_canonical, notes FROM reactions"
+        )
+
+        # Commit everything at once
+        con.commit()
+        # Compact the finished file (rebuilt with the large page size, no dropped-object gaps)
+        con.execute("VACUUM")
+
+        # Restore runtime settings for the DB file
+        try:
+            con.execute("PRAGMA foreign_keys = ON")
+            con.execute("PRAGMA journal_mode = WAL")
+            con.execute("PRAGMA synchronous = NORMAL")
+        except Exception:
+            pass
+
+        # Final counts
+        rcount = con.execute("SELECT COUNT(*) FROM reactions").fetchone()[0]
+        mcount = con.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
+        vcount = con.execute("SELECT COUNT(*) FROM reactions WHERE validated = 1").fetchone()[0]
+
+        print(f"[FAST] DONE! reactions={rcount}, measurements={mcount}, validated={vcount}")
+    finally:
+        if con is not None:
+            con.close()
@@ -1,3 +1,4 @@
+import functools
 import json
 
 
@@ -35,6 +36,38 @@ def load_db(path, image_dir):
     return db_init
 
 
+@functools.lru_cache(maxsize=16)
+def _validation_index(path_str, mtime_ns, size):
+    with open(path_str, "rb") as fh:
+        raw = json.load(fh)
+    index = {}
+    for img, v in raw.items():
+        if isinstance(v, dict):
+            index[img] = {
+                "validated": bool(v.get("validated", False)),
+                "by": v.get("by"),
+                "at": v.get("at"),
+            }
+        else:
+            # Legacy bool (or unknown type, coerced to not validated) as in load_db
+            index[img] = {"validated": v is True, "by": None, "at": None}
+    return index
+
+
+def load_validation_index(path):
+    """Return {image: {"validated", "by", "at"}} for a validation DB, read-only and cached.
+
+    The parsed index is reused until the file's mtime or size changes, so repeated
+    syncs and listings of an unchanged table skip the JSON parse. Normalization matches
+    load_db but is never written back. Treat the result as read-only. Missing file -> {}.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    return _validation_index(str(path), st.st_mtime_ns, st.st_size)
+
+
 def get_stats_for_table(db):
     total = len(db)
 
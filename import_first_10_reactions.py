@@ -1,18 +1,24 @@
-import csv
 import msvcrt
 import re
-import time
+import sqlite3
 from pathlib import Path
 
+from config import get_table_paths
 from reactions_db import (
-    add_measurement,
+    add_measurements_bulk,
     ensure_db,
     get_or_create_reaction,
     upsert_reference,
 )
+from tsv_utils import iter_tsv_rows
 
 RATE_UNIT_PATTERN = re.compile(r"(\d(?:[\d\.\sx×\*\^\-\+]+)?)\s*(.*)")
 
+# kbhit() is a console syscall; poll it once per this many rows rather than every row
+STOP_POLL_MASK = 255
+# Measurements are buffered and written with executemany in batches of this size
+MEASUREMENT_BATCH = 1000
+
 
 def parse_rate_value(raw: str):
     raw = raw.strip()
@@ -45,52 +51,68 @@ def check_for_stop():
     return False
 
 
-def import_single_csv_with_stop(csv_path: Path, table_no: int):
-    """Import a single CSV with user stop capability"""
-    con = ensure_db()
+def import_single_csv_with_stop(
+    csv_path: Path, table_no: int, con: sqlite3.Connection | None = None
+):
+    """Import a single CSV with user stop capability.
+
+    All rows of the file go into one transaction, committed at the end (or on stop).
+    Pass an open connection to reuse it across files.
+    """
+    if con is None:
+        con = ensure_db()
     inserted_reactions = 0
     inserted_measurements = 0
+    pending: list[tuple] = []
 
     try:
         stem = csv_path.stem
         # Derive PNG path
-        from config import get_table_paths
-
         IMAGE_DIR, _, TSV_DIR, _ = get_table_paths(f"table{table_no}")
         png_path = IMAGE_DIR / f"{stem}.png"
         png_path_str = str(png_path) if png_path.exists() else None
-
-        with open(csv_path, newline="", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter="\t")
-            for row_idx, row in enumerate(reader):
-                # Check for user stop request every row
-                if check_for_stop():
-                    con.commit()
-                    return inserted_reactions, inserted_measurements, True
-
-                row = row + [""] * (7 - len(row))
-                buxton_no = row[0].strip() or None
-                reaction_name = row[1].strip() or None
-                formula_latex = row[2].strip() or None
-                pH = row[3].strip() or None
-                rate_value = row[4].strip() or None
-                comments = row[5].strip() or None
-                references_field = row[6].strip() or None
-
-                rid = get_or_create_reaction(
-                    con,
-                    table_no=table_no,
-                    buxton_reaction_number=buxton_no,
-                    reaction_name=reaction_name,
-                    formula_latex=formula_latex,
-                    notes=None,
-                    source_path=str(csv_path),
-                    png_path=png_path_str,
-                )
-                inserted_reactions += 1
-
-                # Upsert a primary reference if a single code present; also store raw text
-                ref_id = upsert_reference(
+        src_str = str(csv_path)
+        # Rows of one file mostly share their references cell; upsert each value once
+        ref_ids: dict[str | None, int | None] = {}
+
+        # One buffered read per file (memory-mapped when large) instead of csv.reader over a
+        # line-buffered text stream; quoted content still goes through csv.reader
+        for row_idx, row in enumerate(iter_tsv_rows(csv_path)):
+            # Check for user stop request every STOP_POLL_MASK + 1 rows
+            if (row_idx & STOP_POLL_MASK) == 0 and check_for_stop():
+                inserted_measurements += add_measurements_bulk(con, pending)
+                con.commit()
+                return inserted_reactions, inserted_measurements, True
+
+            if not any(map(str.strip, row)):
+                continue  # blank line, nothing to record
+            if len(row) < 7:
+                row.extend([""] * (7 - len(row)))
+            buxton_no = row[0].strip() or None
+            reaction_name = row[1].strip() or None
+            formula_latex = row[2].strip() or None
+            pH = row[3].strip() or None
+            rate_value = row[4].strip() or None
+            comments = row[5].strip() or None
+            references_field = row[6].strip() or None
+
+            rid = get_or_create_reaction(
+                con,
+                table_no=table_no,
+                buxton_reaction_number=buxton_no,
+                reaction_name=reaction_name,
+                formula_latex=formula_latex,
+                notes=None,
+                source_path=src_str,
+                png_path=png_path_str,
+            )
+            inserted_reactions += 1
+
+            # Upsert a primary reference if a single code present; also store raw text
+            if references_field in ref_ids:
+                ref_id = ref_ids[references_field]
+            else:
+                ref_id = ref_ids[references_field] = upsert_reference(
                     con,
                     buxton_code=references_field
                     if references_field and "," not in references_field
@@ -99,27 +121,32 @@ def import_single_csv_with_stop(csv_path: Path, table_no: int):
                     doi=None,
                     raw_text=references_field,
                 )
-                rate_num = parse_rate_value(rate_value) if rate_value else None
-                add_measurement(
-                    con,
+            rate_num = parse_rate_value(rate_value) if rate_value else None
+            pending.append(
+                (
                     rid,
-                    pH=pH,
-                    temperature_C=None,
-                    rate_value=rate_value or "",
-                    rate_value_num=rate_num,
-                    rate_units=None,
-                    method=None,
-                    conditions=comments,
-                    reference_id=ref_id,
-                    references_raw=references_field,
-                    source_path=str(csv_path),
-                    page_info=None,
+                    pH,
+                    None,
+                    rate_value or "",
+                    rate_num,
+                    None,
+                    None,
+                    comments,
+                    ref_id,
+                    references_field,
+                    src_str,
+                    None,
                 )
-                inserted_measurements += 1
+            )
+            if len(pending) >= MEASUREMENT_BATCH:
+                batch, pending = pending, []
+                inserted_measurements += add_measurements_bulk(con, batch)
 
     except Exception as e:
         print(f"[IMPORT_ONE] Error processing {csv_path}: {e}")
 
+    # Rows parsed before an error are still written, as with per-row inserts
+    inserted_measurements += add_measurements_bulk(con, pending)
     con.commit()
     return inserted_reactions, inserted_measurements, False
 
@@ -160,7 +187,7 @@ def import_first_10_reactions():
             break
 
         try:
-            reactions, measurements, stopped = import_single_csv_with_stop(csv_path, 8)
+            reactions, measurements, stopped = import_single_csv_with_stop(csv_path, 8, con)
             total_reactions += reactions
             total_measurements += measurements
 
@@ -169,9 +196,6 @@ def import_first_10_reactions():
             if stopped:
                 break
 
-            # Small delay to allow user to press 'q'
-            time.sleep(0.1)
-
         except Exception as e:
             print(f"  ✗ Error processing {csv_path.name}: {e}")
             continue
@@ -1,71 +1,275 @@
-import csv
+import functools
+import math
+import os
 import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 from typing import Any
 
+from bulk_import import PARALLEL_MIN_SOURCES
 from config import get_table_paths
+from db_utils import load_validation_index
 from reactions_db import (
-    add_measurement,
+    add_measurements_bulk,
+    delete_reactions_by_sources,
     ensure_db,
     get_or_create_reaction,
+    get_reaction_ids_by_png,
+    prune_measurements_bulk,
+    replace_measurements_for_source,
+    set_validated_by_sources,
     upsert_reference,
 )
+from tsv_utils import iter_tsv_rows
 
 RATE_UNIT_PATTERN = re.compile(r"(\d(?:[\d\.\sx×\*\^\-\+]+)?)\s*(.*)")
+# Plain decimal base with an optional "x10^n" / "×10^n" exponent (spaces already removed)
+_RATE_RE = re.compile(r"([+-]?(?:\d+\.?\d*|\.\d+))(?:[x×]10\^([+-]?\d+))?")
+_RATE_FIRST_CHARS = frozenset("0123456789.+-")
+# Sources written per transaction in import_from_csvs: amortizes commits without letting
+# one huge table hold the write lock (and grow the WAL) for the whole run
+_SOURCES_PER_COMMIT = 1000
+# Padding for short TSV rows (7 columns); extended in place so full rows allocate nothing
+_EMPTY7 = ("",) * 7
 
 
+def _has_content(row: list[str]) -> bool:
+    """False for TSV rows whose cells are all empty or whitespace."""
+    return any(map(str.strip, row))
+
+
+def _begin_import(con: sqlite3.Connection) -> None:
+    """Open one explicit write transaction for a batch of row inserts.
+
+    Imports otherwise run through sqlite3's implicit transactions; taking the write lock up
+    front (BEGIN IMMEDIATE) makes the whole batch a single commit and fails fast on lock
+    contention instead of mid-file.
+    """
+    if not con.in_transaction:
+        con.execute("BEGIN IMMEDIATE")
+
+
+def _tune_import_connection(con: sqlite3.Connection) -> None:
+    """Raise the page cache on a connection opened by (and only used for) an import.
+
+    A larger cache keeps index pages hot across the batch. It is not applied to connections
+    passed in by a caller, such as the UI's: the setting would outlive the import. mmap stays
+    off, as the database lives on a network-backed volume.
+    """
+    try:
+        con.execute("PRAGMA cache_size = -65536")  # ~64MB page cache for this connection
+    except Exception:
+        pass
+
+
+def _enter_bulk_mode(con: sqlite3.Connection) -> None:
+    """Drop per-commit fsyncs for a bulk load on a connection owned by the caller.
+
+    synchronous is a per-connection setting, so it ends with the connection. journal_mode
+    stays WAL: it is database-wide and the app may have readers open. A crash mid-load can
+    lose the last commits but not corrupt the database; rerunning the import restores them.
+    """
+    try:
+        con.execute("PRAGMA synchronous = OFF")
+    except Exception:
+        pass
+
+
+def _optimize(con: sqlite3.Connection) -> None:
+    """Let SQLite refresh planner statistics after a bulk write (cheap when nothing changed)."""
+    try:
+        con.execute("PRAGMA optimize")
+    except Exception:
+        pass
+
+
+def _reference_id(
+    con: sqlite3.Connection, references_field: str | None, cache: dict[str, int | None]
+) -> int | None:
+    """Upsert the primary reference for a raw references cell, once per distinct value.
+
+    A single code (no comma) is stored as buxton_code; the raw text is always kept.
+    """
+    if not references_field:
+        return None
+    if references_field in cache:
+        return cache[references_field]
+    ref_id = upsert_reference(
+        con,
+        buxton_code=references_field if references_field and "," not in references_field else None,
+        citation_text=None,
+        doi=None,
+        raw_text=references_field,
+    )
+    cache[references_field] = ref_id
+    return ref_id
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_rate_value(raw: str):
+    """Parse a rate cell ("1.5", "5.5 x 10^9", "6.2×10^-4") to a float, or None.
+
+    Non-finite results ("nan", "-inf", "1e999") are None, as in bulk_import.
+    """
     raw = raw.strip()
-    # Very naive numeric extraction to float if simple like 5.5 x 10^9
+    # Every parseable shape starts with a digit, sign or point
+    if not raw or raw[0] not in _RATE_FIRST_CHARS:
+        return None
     try:
+        num = _parse_rate_number(raw)
+    except (ValueError, OverflowError):
+        return None
+    return num if num is not None and math.isfinite(num) else None
+
+
+def _parse_rate_number(raw: str) -> float | None:
+    """parse_rate_value without the finiteness check; raises on unparseable input."""
+    # Common shapes ("1.5", "5.5x10^9", "6.2×10^-4") in one match, no copies of raw
+    m = _RATE_RE.fullmatch(raw)
+    if m is None and "^" not in raw:
+        # No exponent to rewrite: only spaces can stand between float() and the value
+        return float(raw.replace(" ", ""))
+    if m is None:
+        # Very naive numeric extraction to float if simple like 5.5 x 10^9
         # replace LaTeX times and formatting
         s = raw.replace("\\times", "x").replace(" ", "")
-        if "x10^" in s:
-            parts = s.split("x10^")
-            base = float(parts[0])
-            exp = int(parts[1])
-            return base * (10**exp)
-        if "×10^" in s:
-            parts = s.split("×10^")
-            base = float(parts[0])
-            exp = int(parts[1])
-            return base * (10**exp)
-        return float(s)
-    except Exception:
-        return None
+        m = _RATE_RE.fullmatch(s)
+    else:
+        s = raw
+    if m is not None:
+        base_s, exp_s = m.groups()
+        return float(base_s) * (10 ** int(exp_s)) if exp_s else float(base_s)
+    if "x10^" in s:
+        parts = s.split("x10^")
+        base = float(parts[0])
+        exp = int(parts[1])
+        return base * (10**exp)
+    if "×10^" in s:
+        parts = s.split("×10^")
+        base = float(parts[0])
+        exp = int(parts[1])
+        return base * (10**exp)
+    return float(s)
+
+
+def _parse_workers(n_sources: int) -> int:
+    """Thread count for read-ahead parsing: parsing is GIL-bound, so a few threads suffice."""
+    return max(1, min(4, os.cpu_count() or 1, n_sources))
+
+
+def _parse_pool(n_sources: int, *, processes: bool = False) -> Executor:
+    """Executor that parses sources ahead of the (single) writer thread.
+
+    With processes=True (command-line entry points only) large tables get worker processes,
+    as parsing holds the GIL; below PARALLEL_MIN_SOURCES process start-up costs more than it
+    saves. Otherwise a few read-ahead threads are used: forking the multi-threaded Streamlit
+    server can deadlock, and spawned workers would re-import the app.
+    """
+    workers = os.cpu_count() or 1
+    if processes and workers > 1 and n_sources >= PARALLEL_MIN_SOURCES:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=_parse_workers(n_sources))
+
 
+def _scan_sources(tsv_dir: Path) -> list[Path]:
+    """List .csv/.tsv sources in one directory pass, preferring .csv when both exist.
 
-def import_single_csv(csv_path: Path, table_no: int):
+    Order: sorted .csv files, then sorted .tsv files whose stem has no .csv.
+    """
+    csv_names: list[str] = []
+    tsv_names: list[str] = []
+    with os.scandir(tsv_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".csv"):
+                csv_names.append(name)
+            elif name.endswith(".tsv"):
+                tsv_names.append(name)
+    csv_names.sort()
+    tsv_names.sort()
+    csv_stems = {name[:-4] for name in csv_names}
+    return [tsv_dir / name for name in csv_names] + [
+        tsv_dir / name for name in tsv_names if name[:-4] not in csv_stems
+    ]
+
+
+def _scan_sources_or_empty(tsv_dir: Path) -> list[Path]:
+    """_scan_sources, or [] when the directory is missing."""
+    try:
+        return _scan_sources(tsv_dir)
+    except OSError:
+        return []
+
+
+def _png_paths_by_stem(image_dir: Path) -> dict[str, str]:
+    """Map stem -> PNG path string from one listing of image_dir (empty if missing)."""
+    image_dir_str = os.fspath(image_dir)
+    try:
+        with os.scandir(image_dir) as it:
+            return {
+                entry.name[:-4]: os.path.join(image_dir_str, entry.name)
+                for entry in it
+                if entry.name.endswith(".png")
+            }
+    except OSError:
+        return {}
+
+
+def parse_rate_values(values: list[str | None]) -> list[float | None]:
+    """parse_rate_value over a column; empty/None entries map to None.
+
+    Rate columns repeat values heavily, so most lookups are hits in parse_rate_value's
+    lru_cache, which is shared across files.
+    """
+    return [parse_rate_value(v) if v else None for v in values]
+
+
+def import_single_csv(csv_path: Path, table_no: int, con: sqlite3.Connection | None = None):
     """Import a single tab-delimited CSV (TSV content with .csv extension) into reactions.db.
 
     Each CSV row is a measurement. The reaction is determined by the PNG with the same stem.
     If reaction does not exist yet, it will be created with the minimal info available.
+    Pass an open connection to reuse it across files.
     """
-    con = ensure_db()
-    inserted_reactions = 0
+    if con is None:
+        con = ensure_db()
+    _begin_import(con)
+    # Reactions of a partly imported file would be left without their measurements, so a
+    # failure rolls the whole file back
+    con.execute("SAVEPOINT import_file")
     inserted_measurements = 0
+    # One per processed row; all of them are inserted or none are
+    measurement_rows: list[tuple[Any, ...]] = []
     try:
         stem = csv_path.stem
         # Derive PNG path
         # Locate image dir from table number
-        from config import get_table_paths
-
         IMAGE_DIR, _, TSV_DIR, _ = get_table_paths(f"table{table_no}")
         png_path = IMAGE_DIR / f"{stem}.png"
         png_path_str = str(png_path) if png_path.exists() else None
+        src_str = str(csv_path)
+
+        ref_cache: dict[str, int | None] = {}
+        # Consecutive rows usually repeat the reaction columns; an identical call would only
+        # re-run the formula canonicalization and a no-op UPDATE for the same reaction
+        last_meta: tuple[str | None, str | None, str | None] | None = None
+        rid = 0
+        for row in filter(_has_content, iter_tsv_rows(csv_path)):
+            if len(row) < 7:
+                row.extend(_EMPTY7[len(row) :])
+            buxton_no = row[0].strip() or None
+            reaction_name = row[1].strip() or None
+            formula_latex = row[2].strip() or None
+            pH = row[3].strip() or None
+            rate_value = row[4].strip() or None
+            comments = row[5].strip() or None
+            references_field = row[6].strip() or None
 
-        with open(csv_path, newline="", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter="\t")
-            for row in reader:
-                row = row + [""] * (7 - len(row))
-                buxton_no = row[0].strip() or None
-                reaction_name = row[1].strip() or None
-                formula_latex = row[2].strip() or None
-                pH = row[3].strip() or None
-                rate_value = row[4].strip() or None
-                comments = row[5].strip() or None
-                references_field = row[6].strip() or None
-
+            meta = (buxton_no, reaction_name, formula_latex)
+            if meta != last_meta:
                 rid = get_or_create_reaction(
                     con,
                     table_no=table_no,
@@ -73,280 +277,269 @@ def import_single_csv(csv_path: Path, table_no: int):
                     reaction_name=reaction_name,
                     formula_latex=formula_latex,
                     notes=None,
-                    source_path=str(csv_path),
+                    source_path=src_str,
                     png_path=png_path_str,
                 )
-                inserted_reactions += 1
+                last_meta = meta
 
-                # Upsert a primary reference if a single code present; also store raw text
-                ref_id = upsert_reference(
-                    con,
-                    buxton_code=references_field
-                    if references_field and "," not in references_field
-                    else None,
-                    citation_text=None,
-                    doi=None,
-                    raw_text=references_field,
-                )
-                rate_num = parse_rate_value(rate_value) if rate_value else None
-                add_measurement(
-                    con,
+            # Upsert a primary reference if a single code present; also store raw text
+            ref_id = _reference_id(con, references_field, ref_cache) if references_field else None
+            rate_num = parse_rate_value(rate_value) if rate_value else None
+            measurement_rows.append(
+                (
                     rid,
-                    pH=pH,
-                    temperature_C=None,
-                    rate_value=rate_value or "",
-                    rate_value_num=rate_num,
-                    rate_units=None,
-                    method=None,
-                    conditions=comments,
-                    reference_id=ref_id,
-                    references_raw=references_field,
-                    source_path=str(csv_path),
-                    page_info=None,
+                    pH,
+                    None,
+                    rate_value or "",
+                    rate_num,
+                    None,
+                    None,
+                    comments,
+                    ref_id,
+                    references_field,
+                    src_str,
+                    None,
                 )
-                inserted_measurements += 1
+            )
+        inserted_measurements = add_measurements_bulk(con, measurement_rows)
     except Exception as e:
         print(f"[IMPORT_ONE] Error processing {csv_path}: {e}")
+        con.execute("ROLLBACK TO import_file")
+        measurement_rows.clear()
+    con.execute("RELEASE import_file")
     con.commit()
-    return inserted_reactions, inserted_measurements
+    return len(measurement_rows), inserted_measurements
+
+
+def source_columns(
+    rows: Iterable[list[str]],
+) -> tuple[tuple[str | None, str | None, str | None], list[list[str | None]]] | None:
+    """Pad/strip non-blank TSV rows into (reaction_meta, [pH, rate, comments, refs] columns).
+
+    The per-row hot path of parse_source_file. Returns None when rows is empty.
+    """
+    it = iter(rows)
+    r0 = next(it, None)
+    if r0 is None:
+        return None
+    if len(r0) < 7:
+        r0.extend(_EMPTY7[len(r0) :])
+    meta = (r0[0].strip() or None, r0[1].strip() or None, r0[2].strip() or None)
+    # Collected column-wise so the rate column can be parsed as one batch
+    ph_col: list[str | None] = []
+    rate_col: list[str | None] = []
+    comments_col: list[str | None] = []
+    refs_col: list[str | None] = []
+    ph_append, rate_append = ph_col.append, rate_col.append
+    comments_append, refs_append = comments_col.append, refs_col.append
+    for row in chain((r0,), it):
+        if len(row) < 7:
+            row.extend(_EMPTY7[len(row) :])
+        ph_append(row[3].strip() or None)
+        rate_append(row[4].strip() or None)
+        comments_append(row[5].strip() or None)
+        refs_append(row[6].strip() or None)
+    return meta, [ph_col, rate_col, comments_col, refs_col]
+
+
+def parse_source_file(
+    src_path: Path,
+) -> tuple[tuple[str | None, str | None, str | None], list[tuple[Any, ...]]] | None:
+    """Read one TSV source without touching the DB (safe to run in worker threads).
+
+    Returns None for a file without non-blank rows, else (reaction_meta, measurement_fields)
+    where reaction_meta is (buxton_no, reaction_name, formula_latex) from the first row and
+    each measurement field tuple is (pH, rate_value, rate_value_num, comments, references_field).
+    """
+    # Rows are consumed as they are read; only the parsed fields are kept. Blank lines
+    # (trailing newlines, separators) carry nothing to record and are skipped
+    columns = source_columns(filter(_has_content, iter_tsv_rows(src_path)))
+    if columns is None:
+        return None
+    meta, (ph_col, rate_col, comments_col, refs_col) = columns
+    rate_nums = parse_rate_values(rate_col)
+    fields = list(zip(ph_col, rate_col, rate_nums, comments_col, refs_col, strict=True))
+    return meta, fields
 
 
-def import_single_csv_idempotent(csv_path: Path, table_no: int):
+def _parse_source_or_error(src_path: Path):
+    """parse_source_file for pool.map: errors are returned, so one bad file does not stop the map."""
+    try:
+        return parse_source_file(src_path)
+    except Exception as e:
+        return e
+
+
+def _write_source_idempotent(
+    con: sqlite3.Connection,
+    table_no: int,
+    src_path: Path,
+    png_path_str: str | None,
+    parsed: tuple[tuple[str | None, str | None, str | None], list[tuple[Any, ...]]] | None,
+    deferred_prune: dict[int, tuple[str, int]] | None = None,
+    reaction_ids: dict[str, int] | None = None,
+    ref_cache: dict[str, int | None] | None = None,
+) -> int:
+    """Write one parsed source: upsert its reaction and replace its measurements.
+
+    deferred_prune batches the removal of stale measurements (see prune_measurements_bulk);
+    reaction_ids maps PNG paths to known reaction ids (see get_reaction_ids_by_png);
+    ref_cache, shared across sources, upserts each distinct references cell once per run.
+    Returns the number of measurements inserted.
+    """
+    # Prepare reaction from the first row's metadata if available
+    meta, fields = parsed if parsed is not None else ((None, None, None), [])
+    buxton_no, reaction_name, formula_latex = meta
+    src_str = str(src_path)
+    rid = get_or_create_reaction(
+        con,
+        table_no=table_no,
+        buxton_reaction_number=buxton_no,
+        reaction_name=reaction_name,
+        formula_latex=formula_latex,
+        notes=None,
+        source_path=src_str,
+        png_path=png_path_str,
+        reaction_id=reaction_ids.get(png_path_str) if reaction_ids and png_path_str else None,
+    )
+
+    if ref_cache is None:
+        ref_cache = {}
+    measurement_rows = [
+        (
+            rid,
+            pH,
+            None,
+            rate_value or "",
+            rate_num,
+            None,
+            None,
+            comments,
+            # Empty cells (the common case) need neither the cache nor the DB
+            _reference_id(con, references_field, ref_cache) if references_field else None,
+            references_field,
+            src_str,
+            None,
+            ordinal,
+        )
+        for ordinal, (pH, rate_value, rate_num, comments, references_field) in enumerate(fields)
+    ]
+    # Upsert by row ordinal and drop everything else for this reaction (including rows from
+    # other source_path variants), so repeated imports rewrite rows in place
+    return replace_measurements_for_source(
+        con, rid, src_str, measurement_rows, deferred_prune=deferred_prune
+    )
+
+
+def import_single_csv_idempotent(
+    csv_path: Path, table_no: int, con: sqlite3.Connection | None = None
+):
     """Idempotent import for a single CSV.
 
     - Ensures reaction exists/updated via get_or_create_reaction (one reaction per PNG by stem).
     - Replaces measurements originating from this source for that reaction.
+    - Pass an open connection to reuse it across files (e.g. from a sync loop).
     """
-    con = ensure_db()
-    inserted_reactions = 0
-    replaced_measurements = 0
+    if con is None:
+        con = ensure_db()
+    # A caller's open transaction is left to the caller if this file fails
+    owns_transaction = not con.in_transaction
+    _begin_import(con)
+    # The reaction upsert and the measurement replacement land together or not at all
+    con.execute("SAVEPOINT import_file")
     try:
-        from config import get_table_paths
-
         stem = csv_path.stem
         IMAGE_DIR, _, TSV_DIR, _ = get_table_paths(f"table{table_no}")
         png_path = IMAGE_DIR / f"{stem}.png"
         png_path_str = str(png_path) if png_path.exists() else None
 
-        with open(csv_path, newline="", encoding="utf-8") as f:
-            reader = csv.reader(f, delimiter="\t")
-            rows = [r for r in reader]
-        # Prepare reaction from the first row's metadata if available
-        if rows:
-            r0 = rows[0] + [""] * (7 - len(rows[0]))
-            buxton_no = r0[0].strip() or None
-            reaction_name = r0[1].strip() or None
-            formula_latex = r0[2].strip() or None
-        else:
-            buxton_no = reaction_name = formula_latex = None
-
-        rid = get_or_create_reaction(
-            con,
-            table_no=table_no,
-            buxton_reaction_number=buxton_no,
-            reaction_name=reaction_name,
-            formula_latex=formula_latex,
-            notes=None,
-            source_path=str(csv_path),
-            png_path=png_path_str,
-        )
-        inserted_reactions += 1
-
-        # Remove all prior measurements for this reaction to avoid duplicates across source_path variants
-        con.execute(
-            "DELETE FROM measurements WHERE reaction_id = ?",
-            (rid,),
+        parsed = parse_source_file(csv_path)
+        replaced_measurements = _write_source_idempotent(
+            con, table_no, csv_path, png_path_str, parsed
         )
-
-        for row in rows:
-            row = row + [""] * (7 - len(row))
-            buxton_no = row[0].strip() or None
-            reaction_name = row[1].strip() or None
-            formula_latex = row[2].strip() or None
-            pH = row[3].strip() or None
-            rate_value = row[4].strip() or None
-            comments = row[5].strip() or None
-            references_field = row[6].strip() or None
-
-            ref_id = upsert_reference(
-                con,
-                buxton_code=references_field
-                if references_field and "," not in references_field
-                else None,
-                citation_text=None,
-                doi=None,
-                raw_text=references_field,
-            )
-            rate_num = parse_rate_value(rate_value) if rate_value else None
-            add_measurement(
-                con,
-                rid,
-                pH=pH,
-                temperature_C=None,
-                rate_value=rate_value or "",
-                rate_value_num=rate_num,
-                rate_units=None,
-                method=None,
-                conditions=comments,
-                reference_id=ref_id,
-                references_raw=references_field,
-                source_path=str(csv_path),
-                page_info=None,
-            )
-            replaced_measurements += 1
     except Exception as e:
         print(f"[IMPORT_ONE_IDEM] Error processing {csv_path}: {e}")
+        con.execute("ROLLBACK TO import_file")
+        con.execute("RELEASE import_file")
+        if owns_transaction:
+            con.rollback()  # release the write lock taken by _begin_import
+        return 0, 0
+    con.execute("RELEASE import_file")
     con.commit()
-    return inserted_reactions, replaced_measurements
+    return 1, replaced_measurements
+
 
+def import_from_csvs(
+    base_dir: Path | None = None,
+    table_numbers=(5, 6, 7, 8, 9),
+    *,
+    bulk_mode: bool = False,
+    processes: bool = False,
+):
+    """Import every source of the given tables; bulk_mode skips fsyncs for a full reload.
 
-def import_from_csvs(base_dir: Path | None = None, table_numbers=(5, 6, 7, 8, 9)):
+    processes=True parses large tables in worker processes; only pass it from a CLI.
+    """
     con = ensure_db()
+    _tune_import_connection(con)
+    if bulk_mode:
+        _enter_bulk_mode(con)
     inserted_reactions = 0
     inserted_measurements = 0
+    # References repeat across files and tables; each distinct cell is upserted once
+    ref_cache: dict[str, int | None] = {}
 
+    # Every table is listed up front and fed through one pool, so workers start once and keep
+    # reading ahead across table boundaries
+    tables: list[tuple[int, dict[str, str], list[Path]]] = []
     for tno in table_numbers:
         table_name = f"table{tno}"
         IMAGE_DIR, PDF_DIR, TSV_DIR, DB_PATH = get_table_paths(table_name)
         csv_dir = TSV_DIR
         if not csv_dir.exists():
             continue
-        # Prefer .csv over .tsv for the same stem
-        seen: set[str] = set()
-        for csv_path in sorted(csv_dir.glob("*.csv")):
-            seen.add(csv_path.stem)
-            try:
-                # Derive PNG by stem
-                stem = csv_path.stem
-                png_path = IMAGE_DIR / f"{stem}.png"
-                png_path_str = str(png_path) if png_path.exists() else None
-                with open(csv_path, newline="", encoding="utf-8") as f:
-                    reader = csv.reader(f, delimiter="\t")
-                    rows = [r for r in reader]
-                if not rows:
-                    continue
-                r0 = rows[0] + [""] * (7 - len(rows[0]))
-                buxton_no = r0[0].strip() or None
-                reaction_name = r0[1].strip() or None
-                formula_latex = r0[2].strip() or None
-                rid = get_or_create_reaction(
-                    con,
-                    table_no=tno,
-                    buxton_reaction_number=buxton_no,
-                    reaction_name=reaction_name,
-                    formula_latex=formula_latex,
-                    notes=None,
-                    source_path=str(csv_path),
-                    png_path=png_path_str,
-                )
-                inserted_reactions += 1  # upper bound; duplicates are updated not inserted
-                # Remove all prior measurements for this reaction to ensure idempotency
-                con.execute(
-                    "DELETE FROM measurements WHERE reaction_id = ?",
-                    (rid,),
-                )
-                for row in rows:
-                    row = row + [""] * (7 - len(row))
-                    pH = row[3].strip() or None
-                    rate_value = row[4].strip() or None
-                    comments = row[5].strip() or None
-                    references_field = row[6].strip() or None
-                    ref_id = upsert_reference(
-                        con,
-                        buxton_code=references_field
-                        if references_field and "," not in references_field
-                        else None,
-                        citation_text=None,
-                        doi=None,
-                        raw_text=references_field,
-                    )
-                    rate_num = parse_rate_value(rate_value) if rate_value else None
-                    add_measurement(
-                        con,
-                        rid,
-                        pH=pH,
-                        temperature_C=None,
-                        rate_value=rate_value or "",
-                        rate_value_num=rate_num,
-                        rate_units=None,
-                        method=None,
-                        conditions=comments,
-                        reference_id=ref_id,
-                        references_raw=references_field,
-                        source_path=str(csv_path),
-                        page_info=None,
+        # One listing of the image dir instead of a stat() per source; .csv preferred over .tsv
+        tables.append((tno, _png_paths_by_stem(IMAGE_DIR), _scan_sources(csv_dir)))
+
+    n_sources = sum(len(sources) for _, _, sources in tables)
+    with _parse_pool(n_sources, processes=processes) as pool:
+        # Workers read/parse files ahead while this thread writes in source order
+        parsed_iter = pool.map(
+            _parse_source_or_error,
+            chain.from_iterable(sources for _, _, sources in tables),
+            chunksize=16,
+        )
+        for tno, png_by_stem, sources in tables:
+            # Transactions per table (and per _SOURCES_PER_COMMIT sources): a failure later on
+            # does not lose earlier work
+            _begin_import(con)
+            # Existing reactions for the whole table in one query, not one lookup per source
+            reaction_ids = get_reaction_ids_by_png(con, list(png_by_stem.values()))
+            # Stale-measurement deletes, applied in one executemany before each commit
+            prune: dict[int, tuple[str, int]] = {}
+            table_parsed = islice(parsed_iter, len(sources))
+            for i, (src_path, parsed) in enumerate(zip(sources, table_parsed, strict=True), 1):
+                if i % _SOURCES_PER_COMMIT == 0:
+                    prune_measurements_bulk(con, prune)
+                    con.commit()
+                    _begin_import(con)
+                try:
+                    if isinstance(parsed, Exception):
+                        raise parsed
+                    if parsed is None:
+                        continue
+                    # Derive PNG by stem
+                    png_path_str = png_by_stem.get(src_path.stem)
+                    inserted_measurements += _write_source_idempotent(
+                        con, tno, src_path, png_path_str, parsed, prune, reaction_ids, ref_cache
                     )
-                    inserted_measurements += 1
-            except Exception as e:
-                print(f"[IMPORT] Error processing {csv_path}: {e}")
-                continue
-        for tsv_path in sorted(csv_dir.glob("*.tsv")):
-            if tsv_path.stem in seen:
-                continue
-            try:
-                stem = tsv_path.stem
-                png_path = IMAGE_DIR / f"{stem}.png"
-                png_path_str = str(png_path) if png_path.exists() else None
-                with open(tsv_path, newline="", encoding="utf-8") as f:
-                    reader = csv.reader(f, delimiter="\t")
-                    rows = [r for r in reader]
-                if not rows:
+                    inserted_reactions += 1  # upper bound; duplicates are updated not inserted
+                except Exception as e:
+                    print(f"[IMPORT] Error processing {src_path}: {e}")
                     continue
-                r0 = rows[0] + [""] * (7 - len(rows[0]))
-                buxton_no = r0[0].strip() or None
-                reaction_name = r0[1].strip() or None
-                formula_latex = r0[2].strip() or None
-                rid = get_or_create_reaction(
-                    con,
-                    table_no=tno,
-                    buxton_reaction_number=buxton_no,
-                    reaction_name=reaction_name,
-                    formula_latex=formula_latex,
-                    notes=None,
-                    source_path=str(tsv_path),
-                    png_path=png_path_str,
-                )
-                inserted_reactions += 1
-                con.execute(
-                    "DELETE FROM measurements WHERE reaction_id = ?",
-                    (rid,),
-                )
-                for row in rows:
-                    row = row + [""] * (7 - len(row))
-                    pH = row[3].strip() or None
-                    rate_value = row[4].strip() or None
-                    comments = row[5].strip() or None
-                    references_field = row[6].strip() or None
-                    ref_id = upsert_reference(
-                        con,
-                        buxton_code=references_field
-                        if references_field and "," not in references_field
-                        else None,
-                        citation_text=None,
-                        doi=None,
-                        raw_text=references_field,
-                    )
-                    rate_num = parse_rate_value(rate_value) if rate_value else None
-                    add_measurement(
-                        con,
-                        rid,
-                        pH=pH,
-                        temperature_C=None,
-                        rate_value=rate_value or "",
-                        rate_value_num=rate_num,
-                        rate_units=None,
-                        method=None,
-                        conditions=comments,
-                        reference_id=ref_id,
-                        references_raw=references_field,
-                        source_path=str(tsv_path),
-                        page_info=None,
-                    )
-                    inserted_measurements += 1
-            except Exception as e:
-                print(f"[IMPORT] Error processing {tsv_path}: {e}")
-                continue
-    con.commit()
+            prune_measurements_bulk(con, prune)
+            con.commit()
+    _optimize(con)
     print(f"[IMPORT] Done. reactions~{inserted_reactions}, measurements={inserted_measurements}")
 
 
@@ -354,70 +547,81 @@ def list_all_sources_for_table(table_no: int) -> list[Path]:
     """List all .csv/.tsv sources for a table, preferring .csv when both exist."""
     table_name = f"table{table_no}"
     IMAGE_DIR, PDF_DIR, TSV_DIR, DB_PATH = get_table_paths(table_name)
-    sources: list[Path] = []
     if not TSV_DIR.exists():
-        return sources
-    seen: set[str] = set()
-    for p in sorted(TSV_DIR.glob("*.csv")):
-        sources.append(p)
-        seen.add(p.stem)
-    for p in sorted(TSV_DIR.glob("*.tsv")):
-        if p.stem not in seen:
-            sources.append(p)
-    return sources
+        return []
+    return _scan_sources(TSV_DIR)
+
+
+def iter_validated_sources(
+    table_no: int, *, include_unvalidated: bool = False
+) -> Iterator[tuple[str, dict[str, Any], Path | None]]:
+    """Yield (image, meta, source_path) for a table's validation entries.
+
+    source_path is the entry's .csv (preferred) or .tsv by stem, resolved against a single
+    listing of the source directory, or None if neither exists. Entries come from the cached
+    validation index (db_utils.load_validation_index), which is read-only and only re-parsed
+    when the JSON changes. By default only validated entries are yielded.
+    """
+    _, _, TSV_DIR, DB_JSON_PATH = get_table_paths(f"table{table_no}")
+    index = load_validation_index(DB_JSON_PATH)
+    if not index:
+        return
+    entries = (
+        index.items()
+        if include_unvalidated
+        else ((img, meta) for img, meta in index.items() if meta["validated"])
+    )
+    # Paths are built once per existing source rather than twice per entry
+    source_by_stem = {p.stem: p for p in _scan_sources_or_empty(TSV_DIR)}
+    for img, meta in entries:
+        stem = os.path.splitext(os.path.basename(img))[0]
+        yield img, meta, source_by_stem.get(stem)
 
 
 def list_validated_sources_for_table(table_no: int) -> list[Path]:
     """List sources for entries marked validated in validation_db.json (existing files only)."""
-    table_name = f"table{table_no}"
-    IMAGE_DIR, PDF_DIR, TSV_DIR, DB_JSON_PATH = get_table_paths(table_name)
-    sources: list[Path] = []
-    if not DB_JSON_PATH.exists():
-        return sources
     try:
-        from db_utils import load_db
-
-        db = load_db(DB_JSON_PATH, IMAGE_DIR)
+        return [src for _img, _meta, src in iter_validated_sources(table_no) if src is not None]
     except Exception:
-        return sources
-    for img, meta in db.items():
-        if isinstance(meta, bool):
-            is_valid = bool(meta)
-        else:
-            is_valid = bool(meta.get("validated", False))
-        if not is_valid:
-            continue
-        stem = Path(img).stem
-        csv_candidate = TSV_DIR / f"{stem}.csv"
-        tsv_candidate = TSV_DIR / f"{stem}.tsv"
-        source_path = (
-            csv_candidate
-            if csv_candidate.exists()
-            else (tsv_candidate if tsv_candidate.exists() else None)
-        )
-        if source_path is not None:
-            sources.append(source_path)
-    return sources
+        return []
 
 
-def reimport_table_all_sources(table_no: int) -> dict[str, int]:
+def reimport_table_all_sources(table_no: int, *, processes: bool = False) -> dict[str, int]:
     """Delete nothing; import all sources for table into DB (idempotently).
 
+    processes=True parses large tables in worker processes; only pass it from a CLI.
+
     Returns: {'sources': int, 'reactions_imported': int, 'measurements_imported': int}
     """
     con = ensure_db()
+    _tune_import_connection(con)
     sources = list_all_sources_for_table(table_no)
+    IMAGE_DIR, _, _, _ = get_table_paths(f"table{table_no}")
+    png_by_stem = _png_paths_by_stem(IMAGE_DIR)
+    reaction_ids = get_reaction_ids_by_png(con, list(png_by_stem.values()))
     reactions_total = 0
     measurements_total = 0
-    for src in sources:
-        try:
-            rcount, mcount = import_single_csv_idempotent(src, table_no)
-            reactions_total += rcount or 0
-            measurements_total += mcount or 0
-        except Exception as e:
-            print(f"[REIMPORT_ALL] Failed {src}: {e}")
-            continue
+    prune: dict[int, tuple[str, int]] = {}
+    ref_cache: dict[str, int | None] = {}
+    _begin_import(con)
+    with _parse_pool(len(sources), processes=processes) as pool:
+        parsed_iter = pool.map(_parse_source_or_error, sources, chunksize=16)
+        for src, parsed in zip(sources, parsed_iter, strict=True):
+            try:
+                if isinstance(parsed, Exception):
+                    raise parsed
+                png_path_str = png_by_stem.get(src.stem)
+                mcount = _write_source_idempotent(
+                    con, table_no, src, png_path_str, parsed, prune, reaction_ids, ref_cache
+                )
+                reactions_total += 1
+                measurements_total += mcount
+            except Exception as e:
+                print(f"[REIMPORT_ALL] Failed {src}: {e}")
+                continue
+    prune_measurements_bulk(con, prune)
     con.commit()
+    _optimize(con)
     return {
         "sources": len(sources),
         "reactions_imported": reactions_total,
@@ -425,7 +629,13 @@ def reimport_table_all_sources(table_no: int) -> dict[str, int]:
     }
 
 
-def sync_validations_to_db(table_numbers=(5, 6, 7, 8, 9), dry_run: bool = False) -> dict[str, Any]:
+def sync_validations_to_db(
+    table_numbers=(5, 6, 7, 8, 9),
+    dry_run: bool = False,
+    *,
+    bulk_mode: bool = False,
+    processes: bool = False,
+) -> dict[str, Any]:
     """Read each table's validation_db.json and update reactions DB accordingly.
 
     Behavior change:
@@ -434,22 +644,28 @@ def sync_validations_to_db(table_numbers=(5, 6, 7, 8, 9), dry_run: bool = False)
 
     Returns a dict with summary and any issues discovered for UI display.
     If dry_run=True, only scans for missing TSV/CSV and reports issues, no DB writes.
+    bulk_mode=True skips per-commit fsyncs on this call's connection (for large syncs).
+    processes=True parses large tables in worker processes; only pass it from a CLI.
     """
     con = ensure_db()
+    if not dry_run:
+        _tune_import_connection(con)
+    if bulk_mode and not dry_run:
+        _enter_bulk_mode(con)
     updated_total = 0
     imported_total = 0
     deleted_total = 0
     issues: list[dict[str, Any]] = []
+    pending_valid: list[tuple[int, str, str, str | None, str | None]] = []
+    pending_delete: list[tuple[int, str, str]] = []
+    ref_cache: dict[str, int | None] = {}
 
     for tno in table_numbers:
         table_name = f"table{tno}"
         IMAGE_DIR, PDF_DIR, TSV_DIR, DB_JSON_PATH = get_table_paths(table_name)
-        if not DB_JSON_PATH.exists():
-            continue
         try:
-            from db_utils import load_db
-
-            db = load_db(DB_JSON_PATH, IMAGE_DIR)
+            # A dry run only reports on validated entries (missing JSON -> no entries)
+            entries = list(iter_validated_sources(tno, include_unvalidated=not dry_run))
         except Exception as e:
             issues.append(
                 {
@@ -459,26 +675,17 @@ def sync_validations_to_db(table_numbers=(5, 6, 7, 8, 9), dry_run: bool = False)
                 }
             )
             continue
-        for img, meta in db.items():
-            if isinstance(meta, bool):
-                is_valid = bool(meta)
-                by = None
-                at = None
-            else:
-                is_valid = bool(meta.get("validated", False))
-                by = meta.get("by")
-                at = meta.get("at")
-            stem = Path(img).stem
-            csv_candidate = TSV_DIR / f"{stem}.csv"
-            tsv_candidate = TSV_DIR / f"{stem}.tsv"
-            source_path = (
-                csv_candidate
-                if csv_candidate.exists()
-                else (tsv_candidate if tsv_candidate.exists() else None)
-            )
+        if not entries:
+            continue
+        to_import: list[tuple[str, str | None, str | None, Path]] = []
+        for img, meta, source_path in entries:
+            is_valid = meta["validated"]
             if source_path is None:
                 # If this image is marked validated, it's an issue not to find TSV/CSV
                 if is_valid:
+                    stem = Path(img).stem
+                    csv_candidate = TSV_DIR / f"{stem}.csv"
+                    tsv_candidate = TSV_DIR / f"{stem}.tsv"
                     issues.append(
                         {
                             "table_no": tno,
@@ -495,11 +702,50 @@ def sync_validations_to_db(table_numbers=(5, 6, 7, 8, 9), dry_run: bool = False)
                 # Do not modify DB in dry-run
                 continue
             if is_valid:
-                # Import idempotently to ensure entries exist and are refreshed
+                to_import.append((img, meta["by"], meta["at"], source_path))
+            else:
+                # Not validated: remove any existing entries from this source (batched below)
+                pending_delete.append((tno, str(img), str(source_path)))
+        if not to_import:
+            continue
+        # PNGs of imported sources resolved from one listing rather than a stat() per image
+        png_by_stem = _png_paths_by_stem(IMAGE_DIR)
+        reaction_ids = get_reaction_ids_by_png(con, list(png_by_stem.values()))
+        # Validated sources are read and parsed ahead by workers and paired with their entries
+        # in order. Import idempotently to ensure entries exist and are refreshed; all imports
+        # share one transaction, committed with the validation flags below
+        with _parse_pool(len(to_import), processes=processes) as pool:
+            parsed_iter = pool.map(
+                _parse_source_or_error, [src for *_, src in to_import], chunksize=16
+            )
+            for (img, by, at, source_path), parsed in zip(to_import, parsed_iter, strict=True):
+                in_savepoint = False
+                n_refs = len(ref_cache)
                 try:
-                    rcount, _ = import_single_csv_idempotent(source_path, tno)
-                    imported_total += rcount or 0
+                    if isinstance(parsed, Exception):
+                        raise parsed
+                    _begin_import(con)
+                    # Per-source savepoint: a failed source leaves no partial rows in the batch
+                    con.execute("SAVEPOINT sync_source")
+                    in_savepoint = True
+                    _write_source_idempotent(
+                        con,
+                        tno,
+                        source_path,
+                        png_by_stem.get(source_path.stem),
+                        parsed,
+                        reaction_ids=reaction_ids,
+                        ref_cache=ref_cache,
+                    )
+                    con.execute("RELEASE sync_source")
+                    imported_total += 1
                 except Exception as e:
+                    if in_savepoint:
+                        con.execute("ROLLBACK TO sync_source")
+                        con.execute("RELEASE sync_source")
+                        # References upserted by this source were rolled back with it
+                        for ref in list(ref_cache)[n_refs:]:
+                            del ref_cache[ref]
                     issues.append(
                         {
                             "table_no": tno,
@@ -510,48 +756,57 @@ def sync_validations_to_db(table_numbers=(5, 6, 7, 8, 9), dry_run: bool = False)
                         }
                     )
                     continue
-                try:
-                    from reactions_db import set_validated_by_source
-
-                    updated = set_validated_by_source(con, str(source_path), True, by=by, at_iso=at)
-                    if updated == 0:
-                        issues.append(
-                            {
-                                "table_no": tno,
-                                "image": str(img),
-                                "source_path": str(source_path),
-                                "issue": "no_rows_updated",
-                                "message": "No DB rows were updated for this source. Possible path mismatch.",
-                            }
-                        )
-                    updated_total += updated
-                except Exception as e:
-                    issues.append(
-                        {
-                            "table_no": tno,
-                            "image": str(img),
-                            "source_path": str(source_path),
-                            "issue": "update_failed",
-                            "message": f"Failed to set validated flag: {e}",
-                        }
-                    )
-            else:
-                # Not validated: remove any existing entries from this source
-                try:
-                    from reactions_db import delete_reactions_by_source
+                # Flags are set for every imported source after all tables
+                pending_valid.append((tno, str(img), str(source_path), by, at))
 
-                    deleted = delete_reactions_by_source(con, str(source_path))
-                    deleted_total += deleted
-                except Exception as e:
+    if pending_valid:
+        try:
+            updated_by_src = set_validated_by_sources(
+                con, [(src, by, at) for _tno, _img, src, by, at in pending_valid]
+            )
+            for tno, img, src, _by, _at in pending_valid:
+                if updated_by_src.get(src, 0) == 0:
                     issues.append(
                         {
                             "table_no": tno,
-                            "image": str(img),
-                            "source_path": str(source_path),
-                            "issue": "delete_failed",
-                            "message": f"Failed to delete unvalidated entries: {e}",
+                            "image": img,
+                            "source_path": src,
+                            "issue": "no_rows_updated",
+                            "message": "No DB rows were updated for this source. Possible path mismatch.",
                         }
                     )
+            updated_total += sum(updated_by_src.values())
+        except Exception as e:
+            issues.extend(
+                {
+                    "table_no": tno,
+                    "image": img,
+                    "source_path": src,
+                    "issue": "update_failed",
+                    "message": f"Failed to set validated flag: {e}",
+                }
+                for tno, img, src, _by, _at in pending_valid
+            )
+    if pending_delete:
+        try:
+            deleted_by_src = delete_reactions_by_sources(
+                con, [src for _tno, _img, src in pending_delete]
+            )
+            deleted_total += sum(deleted_by_src.values())
+        except Exception as e:
+            issues.extend(
+                {
+                    "table_no": tno,
+                    "image": img,
+                    "source_path": src,
+                    "issue": "delete_failed",
+                    "message": f"Failed to delete unvalidated entries: {e}",
+                }
+                for tno, img, src in pending_delete
+            )
+    if not dry_run:
+        con.commit()
+        _optimize(con)
     summary = {
         "updated_total": updated_total,
         "imported_total": imported_total,
@@ -1,6 +1,7 @@
 import json
 import math
 import sys
+from collections import deque
 from pathlib import Path
 from typing import Any
 
@@ -31,9 +32,11 @@ from auth_db import (
     logout_user,
     show_user_profile_page,
 )
+from pdf_preview import PREVIEW_SCALE, ensure_png_up_to_date, iter_latex_pdfs
 from reactions_db import (
+    db_version_key,
     ensure_db,
-    get_reaction_with_measurements,
+    get_reactions_with_measurements,
     get_validation_meta_by_source,
     get_validation_statistics,
     list_reactions,
@@ -53,10 +56,28 @@ except Exception:
 st.set_page_config(page_title="Radical Reactions Platform (Buxton)", layout="wide")
 
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def _render_pdf_page0_png(path_str: str, mtime_ns: int, zoom: float) -> bytes:
+    """First PDF page as PNG bytes; mtime_ns is part of the key so recompiles re-render."""
+    doc = fitz.open(path_str)
+    try:
+        pix = doc.load_page(0).get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        return pix.tobytes(output="png")
+    finally:
+        doc.close()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _is_admin_cached(username: str) -> bool:
+    """auth_db.is_admin behind a short TTL; role changes apply within 30 s."""
+    return bool(auth_db.is_admin(username))
+
+
 # --- Simple activity logger ---
 def _init_activity_log():
     if "activity_log" not in st.session_state:
-        st.session_state.activity_log = []
+        # Bounded: appends drop the oldest entry instead of re-slicing the list
+        st.session_state.activity_log = deque(maxlen=100)
 
 
 def log_event(msg: str):
@@ -66,9 +87,6 @@ def log_event(msg: str):
         pass
     _init_activity_log()
     st.session_state.activity_log.append(msg)
-    # keep last 100
-    if len(st.session_state.activity_log) > 100:
-        st.session_state.activity_log = st.session_state.activity_log[-100:]
 
 
 # Check authentication status
@@ -81,30 +99,44 @@ import os
 from config import BASE_DIR, get_table_paths
 from reactions_db import DB_PATH
 
-print(f"[VOLUME DEBUG] BASE_DIR resolved to: {BASE_DIR}")
-print(f"[VOLUME DEBUG] DB_PATH resolved to: {DB_PATH}")
-try:
-    from auth_db import auth_db as _adb
-
-    print(f"[VOLUME DEBUG] USERS_DB resolved to: {_adb.db_path}")
-except Exception as _e:
-    print(f"[VOLUME DEBUG] USERS_DB path unavailable: {_e}")
-print(f"[VOLUME DEBUG] /data exists: {os.path.exists('/data')}")
-print(f"[VOLUME DEBUG] BASE_DIR exists: {BASE_DIR.exists()}")
-print(f"[VOLUME DEBUG] DB file exists: {DB_PATH.exists()}")
-if DB_PATH.exists():
-    print(f"[VOLUME DEBUG] DB file size: {DB_PATH.stat().st_size} bytes")
-    print(f"[VOLUME DEBUG] DB file modified: {DB_PATH.stat().st_mtime}")
-print(
-    f"[VOLUME DEBUG] /data contents: {list(Path('/data').glob('*')) if Path('/data').exists() else 'N/A'}"
-)
+
+def _log_volume_diagnostics():
+    print(f"[VOLUME DEBUG] BASE_DIR resolved to: {BASE_DIR}")
+    print(f"[VOLUME DEBUG] DB_PATH resolved to: {DB_PATH}")
+    try:
+        from auth_db import auth_db as _adb
+
+        print(f"[VOLUME DEBUG] USERS_DB resolved to: {_adb.db_path}")
+    except Exception as _e:
+        print(f"[VOLUME DEBUG] USERS_DB path unavailable: {_e}")
+    data_exists = os.path.exists("/data")
+    print(f"[VOLUME DEBUG] /data exists: {data_exists}")
+    print(f"[VOLUME DEBUG] BASE_DIR exists: {BASE_DIR.exists()}")
+    try:
+        db_stat = DB_PATH.stat()
+    except OSError:
+        db_stat = None
+    print(f"[VOLUME DEBUG] DB file exists: {db_stat is not None}")
+    if db_stat is not None:
+        print(f"[VOLUME DEBUG] DB file size: {db_stat.st_size} bytes")
+        print(f"[VOLUME DEBUG] DB file modified: {db_stat.st_mtime}")
+    contents: Any = "N/A"
+    if data_exists:
+        with os.scandir("/data") as it:
+            contents = [entry.path for entry in it]
+    print(f"[VOLUME DEBUG] /data contents: {contents}")
+
+
+# Paths do not change between reruns: log them once per process, like the preview scan below
+if os.environ.get("RAD_VOLUME_DEBUG_LOGGED") != "1":
+    os.environ["RAD_VOLUME_DEBUG_LOGGED"] = "1"
+    _log_volume_diagnostics()
 
 # One-time initial scan to ensure PNG previews exist for PDFs on Railway
 try:
     import threading as _th
 
     from config import get_data_dir as _get_data_dir
-    from pdf_preview import ensure_png_up_to_date
 
     def _start_initial_pdf_preview_scan():
         try:
@@ -130,7 +162,7 @@ try:
                 cutoff = _time.time() - window_days * 86400
 
                 def _iter_pdfs():
-                    for pdf in base_dir.rglob("latex/*.pdf"):
+                    for pdf in iter_latex_pdfs(base_dir):
                         if mode == "all":
                             yield pdf
                         else:
@@ -327,20 +359,22 @@ else:
 # === VALIDATION STATISTICS (for all users) ===
 st.subheader("📊 Project Statistics")
 
-if _db_paused:
-    st.info("Statistics are temporarily unavailable during maintenance.")
-else:
-    try:
-        assert con is not None, "Database connection is None"
-        # Cache expensive stats for short TTL to reduce DB and FS load
-        from reactions_db import DB_PATH as _DBP
 
-        @st.cache_data(ttl=30)
-        def _get_stats_cached(db_mtime: float) -> dict[str, Any]:
+@st.fragment(run_every=60)
+def _stats_fragment() -> None:
+    """Statistics block as a fragment: refreshed every minute without rerunning the page."""
+    try:
+        # Cache expensive stats for short TTL to reduce DB and FS load; keyed on the DB/WAL
+        # change token so writes invalidate it before the TTL does
+        @st.cache_data(ttl=30, show_spinner=False)
+        def _get_stats_cached(db_version: tuple[int, int, int, int]) -> dict[str, Any]:
             con2 = ensure_db()
-            return get_validation_statistics(con2)
+            try:
+                return get_validation_statistics(con2)
+            finally:
+                con2.close()
 
-        stats = _get_stats_cached(_DBP.stat().st_mtime)
+        stats = _get_stats_cached(db_version_key())
 
         # Global overview
         global_stats = stats["global"]
@@ -412,6 +446,12 @@ else:
     except Exception as e:
         st.error(f"Could not load statistics: {e}")
 
+
+if _db_paused:
+    st.info("Statistics are temporarily unavailable during maintenance.")
+else:
+    _stats_fragment()
+
 st.markdown("---")
 
 # Activity log (visible only to superuser)
@@ -419,7 +459,7 @@ if current_user == "saldenisov":
     with st.expander("🪵 Activity Log", expanded=False):
         _init_activity_log()
         if st.session_state.activity_log:
-            for entry in st.session_state.activity_log[-15:]:
+            for entry in list(st.session_state.activity_log)[-15:]:
                 st.write(f"- {entry}")
         else:
             st.caption("No activity yet")
@@ -428,32 +468,38 @@ if current_user == "saldenisov":
 browse_tab, search_tab = st.tabs(["📚 Browse Reactions", "🔎 Search Reactions"])
 
 
-with browse_tab:
-    if st.session_state.get("db_paused", False):
-        st.info("DB access is paused for maintenance. Resume in Admin Tools to browse.")
-    else:
+@st.fragment
+def _browse_fragment() -> None:
+    """Browse list + detail pane; its widgets rerun only this fragment, not the whole page."""
+    # Own connection: a fragment rerun can run on another thread than the full script run
+    con = ensure_db()
+    try:
         left, right = st.columns([1.2, 2])
         with left:
             name_filter = st.text_input("Filter by name/formula", placeholder="type to filter...")
-            assert con is not None, "Database connection is None"
-            # Cache list results to avoid repeated DB scans on each rerun
-            from reactions_db import DB_PATH as _DBP
 
-            @st.cache_data(ttl=20)
+            # Cache list results to avoid repeated DB scans on each rerun (e.g. page clicks)
+            @st.cache_data(ttl=20, show_spinner=False)
             def _list_reactions_cached(
-                name_filter: str, validated_only: bool, limit: int, db_mtime: float
+                name_filter: str,
+                validated_only: bool,
+                limit: int,
+                db_version: tuple[int, int, int, int],
             ) -> list[dict]:
                 con2 = ensure_db()
-                rows = list_reactions(
-                    con2,
-                    name_filter=name_filter or None,
-                    limit=limit,
-                    validated_only=validated_only,
-                )
-                # Convert sqlite3.Row to plain dicts for caching
-                return [dict(r) for r in rows]
+                try:
+                    rows = list_reactions(
+                        con2,
+                        name_filter=name_filter or None,
+                        limit=limit,
+                        validated_only=validated_only,
+                    )
+                    # Convert sqlite3.Row to plain dicts for caching
+                    return [dict(r) for r in rows]
+                finally:
+                    con2.close()
 
-            rows_all = _list_reactions_cached(name_filter or "", True, 2000, _DBP.stat().st_mtime)
+            rows_all = _list_reactions_cached(name_filter or "", True, 2000, db_version_key())
             if not rows_all:
                 st.info("No validated reactions yet.")
             else:
@@ -477,29 +523,32 @@ with browse_tab:
                     if st.button("◀ Prev", disabled=(page == 0)):
                         log_event("Browse: Prev page")
                         st.session_state.browse_page = max(0, page - 1)
-                        st.rerun()
+                        st.rerun(scope="fragment")
                 with pc2:
                     st.write(f"Page {page + 1} / {total_pages}  ")
                 with pc3:
                     if st.button("Next ▶", disabled=(page >= total_pages - 1)):
                         log_event("Browse: Next page")
                         st.session_state.browse_page = min(total_pages - 1, page + 1)
-                        st.rerun()
+                        st.rerun(scope="fragment")
 
                 # Build a simple list with per-row checkboxes (only Name and Formula)
                 if "browse_selected" not in st.session_state:
                     st.session_state.browse_selected = set()
                 current_selected = set(st.session_state.get("browse_selected", set()))
                 new_selected = set()
-                for r in page_rows:
-                    rid = int(r["id"])
-                    label_name = (r["reaction_name"] or "").strip()
-                    label = f"{label_name} | {r['formula_canonical']}".strip(" |")
-                    checked = st.checkbox(
-                        label, value=(rid in current_selected), key=f"browse_chk_{rid}"
-                    )
-                    if checked:
-                        new_selected.add(rid)
+                # Toggles are committed together on submit: one rerun per selection, not per box
+                with st.form("browse_select_form"):
+                    for r in page_rows:
+                        rid = int(r["id"])
+                        label_name = (r["reaction_name"] or "").strip()
+                        label = f"{label_name} | {r['formula_canonical']}".strip(" |")
+                        checked = st.checkbox(
+                            label, value=(rid in current_selected), key=f"browse_chk_{rid}"
+                        )
+                        if checked:
+                            new_selected.add(rid)
+                    st.form_submit_button("Show selected")
                 st.session_state.browse_selected = new_selected
                 st.session_state.selected_reaction_ids = sorted(list(new_selected))
         with right:
@@ -507,9 +556,15 @@ with browse_tab:
             if not sel_ids:
                 st.info("Select one or more reactions from the table to view details.")
             else:
+                # All selected reactions and their measurements in one round of queries
+                details = get_reactions_with_measurements(con, sel_ids)
+                # Admin/non-admin actions: the role is looked up once, not per reaction
+                try:
+                    is_admin = _is_admin_cached(current_user) if current_user else False
+                except Exception:
+                    is_admin = False
                 for rid in sel_ids:
-                    assert con is not None, "Database connection is None"
-                    data = get_reaction_with_measurements(con, rid)
+                    data = details.get(rid, {})
                     rec: Any = data.get("reaction")
                     ms = data.get("measurements", [])
                     if not rec:
@@ -523,36 +578,42 @@ with browse_tab:
                         if rec["notes"]:
                             st.markdown(f"**Notes:** {rec['notes']}")
 
+                        # Table dirs and file stem, resolved once for the PDF preview and the
+                        # TSV tools below (sqlite3.Row has no .get(); guard the key access)
+                        try:
+                            _png_val = rec["png_path"]
+                            stem = Path(str(_png_val)).stem if _png_val else None
+                            tno = int(rec["table_no"])
+                            _, PDF_DIR, TSV_DIR, _ = get_table_paths(f"table{tno}")
+                        except Exception:
+                            stem = None
+
                         # Render compiled PDF (as PNG) if available, above validation info
                         try:
-                            # sqlite3.Row does not support .get(); use key access with guards
-                            try:
-                                _tno_val = rec["table_no"]
-                            except Exception:
-                                _tno_val = None
-                            try:
-                                _png_val = rec["png_path"]
-                            except Exception:
-                                _png_val = None
-                            tno = int(_tno_val) if _tno_val is not None else None
-                            png_path = str(_png_val) if _png_val else ""
-                            stem = Path(png_path).stem if png_path else None
-                            if tno and stem:
-                                IMAGE_DIR, PDF_DIR, TSV_DIR, _ = get_table_paths(f"table{tno}")
+                            if stem:
                                 possible_pdf_paths = [
                                     PDF_DIR / f"{stem}.pdf",
                                     TSV_DIR / "latex" / f"{stem}.pdf",
                                 ]
                                 for _pdf in possible_pdf_paths:
                                     if _pdf.exists():
-                                        if HAS_FITZ_MAIN:
+                                        # Serve the pre-rendered preview PNG from disk when it
+                                        # is newer than the PDF (re-rendered once otherwise)
+                                        _preview = ensure_png_up_to_date(_pdf)
+                                        if _preview.exists():
+                                            st.image(
+                                                _preview.read_bytes(),
+                                                use_container_width=True,
+                                                caption=f"PDF: {_pdf.name}",
+                                            )
+                                        elif HAS_FITZ_MAIN:
                                             try:
-                                                doc = fitz.open(_pdf)
-                                                pix = doc.load_page(0).get_pixmap(
-                                                    matrix=fitz.Matrix(2.0, 2.0)
-                                                )
                                                 st.image(
-                                                    pix.tobytes(output="png"),
+                                                    _render_pdf_page0_png(
+                                                        str(_pdf),
+                                                        _pdf.stat().st_mtime_ns,
+                                                        PREVIEW_SCALE,
+                                                    ),
                                                     use_container_width=True,
                                                     caption=f"PDF: {_pdf.name}",
                                                 )
@@ -571,41 +632,29 @@ with browse_tab:
                         # Validator metadata from DB
                         try:
                             src = rec["source_path"] or ""
-                            if src:
-                                assert con is not None, "Database connection is None"
+                            if rec["validated"]:
+                                # The reaction row already carries its own validation fields
+                                meta = {
+                                    "validated": True,
+                                    "by": rec["validated_by"],
+                                    "at": rec["validated_at"],
+                                }
+                            elif src:
                                 meta = get_validation_meta_by_source(con, src)
-                                if meta.get("validated"):
-                                    who = meta.get("by") or "unknown"
-                                    when = meta.get("at") or "unknown time"
-                                    st.markdown(f"**Validated by:** {who}  ")
-                                    st.markdown(f"**Validated at:** {when}")
+                            else:
+                                meta = {}
+                            if meta.get("validated"):
+                                who = meta.get("by") or "unknown"
+                                when = meta.get("at") or "unknown time"
+                                st.markdown(f"**Validated by:** {who}  ")
+                                st.markdown(f"**Validated at:** {when}")
                         except Exception:
                             pass
 
-                        # Admin/non-admin actions
-                        try:
-                            from auth_db import auth_db as _adb
-
-                            is_admin = bool(_adb.is_admin(current_user)) if current_user else False
-                        except Exception:
-                            is_admin = False
-
                         # Determine paths for potential TSV editing or reporting
                         try:
-                            try:
-                                _tno_val = rec["table_no"]
-                            except Exception:
-                                _tno_val = None
-                            try:
-                                _png_val = rec["png_path"]
-                            except Exception:
-                                _png_val = None
-                            tno = int(_tno_val) if _tno_val is not None else None
-                            png_path = str(_png_val) if _png_val else ""
-                            stem = Path(png_path).stem if png_path else None
                             src_csv = None
-                            if tno and stem:
-                                _, _PDF_DIR, TSV_DIR, _ = get_table_paths(f"table{tno}")
+                            if stem:
                                 csv_path = TSV_DIR / f"{stem}.csv"
                                 tsv_path = TSV_DIR / f"{stem}.tsv"
                                 src_csv = (
@@ -650,8 +699,9 @@ with browse_tab:
                                             key=f"recompile_tsv_{rid}",
                                         ):
                                             try:
-                                                Path(src_csv).write_text(edited, encoding="utf-8")
-                                                _ = correct_tsv_file(Path(src_csv))
+                                                # Edited text is corrected in memory and
+                                                # written once
+                                                _ = correct_tsv_file(Path(src_csv), edited)
                                                 lp = tsv_to_full_latex_article(Path(src_csv))
                                                 rc, out = compile_tex_to_pdf(lp)
                                                 if rc != 0:
@@ -665,12 +715,12 @@ with browse_tab:
                                                                 lp.stem + ".pdf"
                                                             )
                                                             if pdf_file.exists():
-                                                                doc = fitz.open(pdf_file)
-                                                                pix = doc.load_page(0).get_pixmap(
-                                                                    matrix=fitz.Matrix(2, 2)
-                                                                )
                                                                 st.image(
-                                                                    pix.tobytes(output="png"),
+                                                                    _render_pdf_page0_png(
+                                                                        str(pdf_file),
+                                                                        pdf_file.stat().st_mtime_ns,
+                                                                        PREVIEW_SCALE,
+                                                                    ),
                                                                     use_container_width=True,
                                                                 )
                                                     except Exception as e:
@@ -751,6 +801,15 @@ with browse_tab:
                                 )
                                 if ref_label:
                                     st.markdown(f"  ↳ Reference: {ref_label}")
+    finally:
+        con.close()
+
+
+with browse_tab:
+    if st.session_state.get("db_paused", False):
+        st.info("DB access is paused for maintenance. Resume in Admin Tools to browse.")
+    else:
+        _browse_fragment()
 
 with search_tab:
     if st.session_state.get("db_paused", False):
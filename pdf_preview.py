@@ -3,6 +3,10 @@ from __future__ import annotations
 import os
 import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 # Optional dependency: PyMuPDF (pymupdf)
 try:
@@ -13,6 +17,9 @@ except Exception:  # pragma: no cover - environment dependent
     fitz = None
     HAS_FITZ = False
 
+# Raster scale of first-page previews (on-disk .render.png and in-app renders alike)
+PREVIEW_SCALE = 1.5
+
 
 def _is_container_env() -> bool:
     """Heuristic: run only in container (Railway) where /data mount exists."""
@@ -32,8 +39,28 @@ def preview_png_path_for_pdf(pdf_path: Path) -> Path:
     return pdf_path.parent / f"{pdf_path.stem}.render.png"
 
 
+def iter_latex_pdfs(base_dir: Path) -> Iterator[Path]:
+    """Yield PDFs directly inside any ``latex`` directory under base_dir.
+
+    Same files as ``base_dir.rglob("latex/*.pdf")`` (symlinked dirs are not followed), but
+    walked with os.scandir so directory entries are classified without extra stat() calls.
+    """
+    stack: list[tuple[str, bool]] = [(str(base_dir), False)]
+    while stack:
+        path, in_latex = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, entry.name == "latex"))
+                    elif in_latex and entry.name.endswith(".pdf"):
+                        yield Path(entry.path)
+        except OSError:
+            continue
+
+
 def render_pdf_first_page_to_png(
-    pdf_path: Path, out_png: Path | None = None, scale: float = 1.5
+    pdf_path: Path, out_png: Path | None = None, scale: float = PREVIEW_SCALE
 ) -> Path:
     """Render the first page of a PDF to a PNG file using PyMuPDF.
 
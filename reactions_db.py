@@ -1,10 +1,13 @@
+import functools
 import json
+import os
 import re
 import sqlite3
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
-from config import BASE_DIR
+from config import AVAILABLE_TABLES, BASE_DIR, get_table_paths
 
 DB_PATH = BASE_DIR / "reactions.db"
 
@@ -16,9 +19,14 @@ TABLE_CATEGORY = {
     9: "Rate constants for reactions of the oxide radical ion in aqueous solution",
 }
 
+# Keep IN (...) lists under SQLite's historical 999 bound-variable limit
+_IN_CHUNK = 500
+
 
 def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
-    con = sqlite3.connect(str(db_path))
+    # Larger statement cache: import/sync loops cycle through more distinct statements
+    # than the default 128, and a cache miss means re-parsing the SQL
+    con = sqlite3.connect(str(db_path), cached_statements=256)
     con.row_factory = sqlite3.Row
     con.execute("PRAGMA foreign_keys = ON")
     # Reduce 'database is locked' errors by waiting up to 5s for locks
@@ -46,6 +54,23 @@ def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
     return con
 
 
+def db_version_key(db_path: Path = DB_PATH) -> tuple[int, int, int, int]:
+    """Cheap change token for UI caches: (mtime_ns, size) of the DB and of its WAL file.
+
+    In WAL mode commits land in the -wal file and only reach the main file at checkpoints,
+    so the main file's mtime alone misses recent writes.
+    """
+    out: list[int] = []
+    for path in (str(db_path), f"{db_path}-wal"):
+        try:
+            st = os.stat(path)
+        except OSError:
+            out += (0, 0)
+        else:
+            out += (st.st_mtime_ns, st.st_size)
+    return out[0], out[1], out[2], out[3]
+
+
 SCHEMA_SQL = r"""
 BEGIN;
 CREATE TABLE IF NOT EXISTS schema_migrations (
@@ -108,6 +133,7 @@ CREATE TABLE IF NOT EXISTS measurements (
   references_raw TEXT, -- full raw references field from CSV (may include many)
   source_path TEXT, -- CSV path
   page_info TEXT,
+  row_ordinal INTEGER, -- 0-based row within source_path; key for idempotent re-imports
   created_at TEXT NOT NULL DEFAULT (datetime('now')),
   updated_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
@@ -138,8 +164,24 @@ COMMIT;
 MIGRATION_NAME_INIT = "001_init"
 
 
+# DBs whose schema/migration checks already ran in this process, keyed by _migration_key.
+# The UI calls ensure_db() on every rerun, and the checks include writes.
+_MIGRATED: set[tuple[str, int, int]] = set()
+
+
+def _migration_key(con: sqlite3.Connection, db_path: Path) -> tuple[str, int, int] | None:
+    """(path, inode, schema_version): a swapped-in file or any schema change re-runs checks."""
+    try:
+        inode = os.stat(db_path).st_ino
+    except OSError:
+        return None
+    return str(db_path), inode, con.execute("PRAGMA schema_version").fetchone()[0]
+
+
 def ensure_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
     con = connect(db_path)
+    if _migration_key(con, db_path) in _MIGRATED:
+        return con
     # check migration applied
     con.execute(
         "CREATE TABLE IF NOT EXISTS schema_migrations (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, applied_at TEXT NOT NULL DEFAULT (datetime('now')))"
@@ -149,6 +191,9 @@ def ensure_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
         con.executescript(SCHEMA_SQL)
         con.execute("INSERT INTO schema_migrations(name) VALUES (?)", (MIGRATION_NAME_INIT,))
         con.commit()
+    # Only a run where every step succeeded is remembered in _MIGRATED; a transient lock
+    # leaves the checks to be retried by the next call
+    complete = True
     # Lightweight migrations for added columns/indexes if DB already existed
     try:
         cols_r = {row[1] for row in con.execute("PRAGMA table_info(reactions)").fetchall()}
@@ -172,12 +217,14 @@ def ensure_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
         cols_m = {row[1] for row in con.execute("PRAGMA table_info(measurements)").fetchall()}
         if "references_raw" not in cols_m:
             con.execute("ALTER TABLE measurements ADD COLUMN references_raw TEXT")
+        if "row_ordinal" not in cols_m:
+            con.execute("ALTER TABLE measurements ADD COLUMN row_ordinal INTEGER")
         cols_ref = {row[1] for row in con.execute("PRAGMA table_info(references_map)").fetchall()}
         if "raw_text" not in cols_ref:
             con.execute("ALTER TABLE references_map ADD COLUMN raw_text TEXT")
         con.commit()
     except Exception:
-        pass
+        complete = False
 
     # Migration: update table_category strings per TABLE_CATEGORY mapping
     try:
@@ -185,7 +232,7 @@ def ensure_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
             con.execute("UPDATE reactions SET table_category = ? WHERE table_no = ?", (cat, tno))
         con.commit()
     except Exception:
-        pass
+        complete = False
 
     # Ensure performance indexes exist
     try:
@@ -195,17 +242,35 @@ def ensure_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
             "CREATE INDEX IF NOT EXISTS idx_reactions_validated ON reactions(validated)",
             "CREATE INDEX IF NOT EXISTS idx_reactions_skipped ON reactions(skipped)",
             "CREATE INDEX IF NOT EXISTS idx_reactions_table_no ON reactions(table_no)",
-            "CREATE INDEX IF NOT EXISTS idx_measurements_reaction_source ON measurements(reaction_id, source_path)",
+            # Conflict target for replace_measurements_for_source (NULL ordinals never collide)
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_measurements_source_row ON measurements(reaction_id, source_path, row_ordinal)",
         ]
         for stmt in index_statements:
             try:
                 con.execute(stmt)
             except Exception:
-                pass
+                complete = False
+        # The unique row index leads with (reaction_id, source_path) and serves those lookups,
+        # so a separate index on that prefix is only extra B-tree work on every measurement
+        # write; it is kept only where the unique index could not be built
+        has_row_index = con.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_measurements_source_row'"
+        ).fetchone()
+        if has_row_index:
+            con.execute("DROP INDEX IF EXISTS idx_measurements_reaction_source")
+        else:
+            # The upserts need this conflict target: never cache a DB without it
+            complete = False
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS idx_measurements_reaction_source ON measurements(reaction_id, source_path)"
+            )
         con.commit()
     except Exception:
-        pass
+        complete = False
 
+    key = _migration_key(con, db_path) if complete else None
+    if key is not None:
+        _MIGRATED.add(key)
     return con
 
 
@@ -367,6 +432,25 @@ def upsert_reference(
     return cur.lastrowid
 
 
+@functools.lru_cache(maxsize=4096)
+def _canonical_fields(
+    formula_latex: str,
+) -> tuple[str, str, str, str | None, str | None]:
+    """latex_to_canonical with species lists as JSON (None when empty), memoized.
+
+    Re-imports and syncs pass the same formulas again and again; this keeps the parse and
+    the JSON encoding to once per distinct formula.
+    """
+    canonical, reactants, products, r_species, p_species = latex_to_canonical(formula_latex)
+    return (
+        canonical,
+        reactants,
+        products,
+        json.dumps(r_species, ensure_ascii=False) if r_species else None,
+        json.dumps(p_species, ensure_ascii=False) if p_species else None,
+    )
+
+
 def get_or_create_reaction(
     con: sqlite3.Connection,
     *,
@@ -377,11 +461,13 @@ def get_or_create_reaction(
     notes: str | None,
     source_path: str | None,
     png_path: str | None,
+    reaction_id: int | None = None,
 ) -> int:
     """Create or update a reaction row for a given PNG (one reaction per PNG).
 
     Deduplicate primarily by png_path. If formula is present, also compute canonical
-    representation for search and display.
+    representation for search and display. reaction_id, when the caller already knows
+    the row holding png_path (see get_reaction_ids_by_png), skips that lookup.
     """
     category = TABLE_CATEGORY.get(table_no, str(table_no))
     # Canonicalize paths
@@ -390,13 +476,17 @@ def get_or_create_reaction(
 
     # Compute canonical fields if we have a formula
     if formula_latex:
-        canonical, reactants, products, r_species, p_species = latex_to_canonical(formula_latex)
+        canonical, reactants, products, r_species_json, p_species_json = _canonical_fields(
+            formula_latex
+        )
     else:
-        canonical, reactants, products, r_species, p_species = (None, "", "", [], [])
+        canonical, reactants, products, r_species_json, p_species_json = (None, "", "", None, None)
 
     # Dedup ONLY by png_path (each PNG is a distinct reaction)
     row = None
-    if png_canon:
+    if reaction_id is not None:
+        row = (reaction_id,)
+    elif png_canon:
         row = con.execute(
             "SELECT id FROM reactions WHERE png_path = ?",
             (png_canon,),
@@ -425,8 +515,8 @@ def get_or_create_reaction(
                 canonical,
                 reactants,
                 products,
-                json.dumps(r_species, ensure_ascii=False) if r_species else None,
-                json.dumps(p_species, ensure_ascii=False) if p_species else None,
+                r_species_json,
+                p_species_json,
                 notes,
                 src_canon,
                 rid,
@@ -471,8 +561,8 @@ def get_or_create_reaction(
                     canonical,
                     reactants,
                     products,
-                    json.dumps(r_species, ensure_ascii=False) if r_species else None,
-                    json.dumps(p_species, ensure_ascii=False) if p_species else None,
+                    r_species_json,
+                    p_species_json,
                     notes,
                     src_canon,
                     png_canon,
@@ -498,8 +588,8 @@ def get_or_create_reaction(
             canonical,
             reactants,
             products,
-            json.dumps(r_species, ensure_ascii=False) if r_species else None,
-            json.dumps(p_species, ensure_ascii=False) if p_species else None,
+            r_species_json,
+            p_species_json,
             notes,
             png_canon,
             src_canon,
@@ -509,6 +599,47 @@ def get_or_create_reaction(
     return cur.lastrowid
 
 
+def get_reaction_ids_by_png(con: sqlite3.Connection, png_paths: list[str]) -> dict[str, int]:
+    """Map each given PNG path to the id of the reaction holding it (absent ones omitted).
+
+    One query per _IN_CHUNK paths, so a table's worth of get_or_create_reaction calls can
+    skip their per-call png_path lookup.
+    """
+    canon_to_paths: dict[str, list[str]] = {}
+    for p in png_paths:
+        canon_to_paths.setdefault(canonicalize_source_path(p), []).append(p)
+    canonical_paths = list(canon_to_paths)
+    result: dict[str, int] = {}
+    for i in range(0, len(canonical_paths), _IN_CHUNK):
+        chunk = canonical_paths[i : i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        for row in con.execute(
+            f"SELECT png_path, id FROM reactions WHERE png_path IN ({placeholders})", chunk
+        ):
+            for p in canon_to_paths[row[0]]:
+                result[p] = row[1]
+    return result
+
+
+INSERT_MEASUREMENT_SQL = """
+INSERT INTO measurements(
+  reaction_id, pH, temperature_C, rate_value, rate_value_num, rate_units,
+  method, conditions, reference_id, references_raw, source_path, page_info
+)
+VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+"""
+
+
+# Full batches of this many rows go through one multi-row INSERT (12 parameters per row,
+# kept under SQLite's historical 999 bound-variable limit); the tail uses executemany
+_MEASUREMENT_ROWS_PER_INSERT = 999 // 12
+_MULTI_INSERT_MEASUREMENT_SQL = (
+    INSERT_MEASUREMENT_SQL[: INSERT_MEASUREMENT_SQL.index("VALUES")]
+    + "VALUES "
+    + ",".join(["(?,?,?,?,?,?,?,?,?,?,?,?)"] * _MEASUREMENT_ROWS_PER_INSERT)
+)
+
+
 def add_measurement(
     con: sqlite3.Connection,
     reaction_id: int,
@@ -526,13 +657,7 @@ def add_measurement(
     page_info: str | None,
 ) -> int:
     cur = con.execute(
-        """
-        INSERT INTO measurements(
-          reaction_id, pH, temperature_C, rate_value, rate_value_num, rate_units,
-          method, conditions, reference_id, references_raw, source_path, page_info
-        )
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
-        """,
+        INSERT_MEASUREMENT_SQL,
         (
             reaction_id,
             pH,
@@ -552,6 +677,91 @@ def add_measurement(
     return cur.lastrowid
 
 
+UPSERT_MEASUREMENT_SQL = """
+INSERT INTO measurements(
+  reaction_id, pH, temperature_C, rate_value, rate_value_num, rate_units,
+  method, conditions, reference_id, references_raw, source_path, page_info, row_ordinal
+)
+VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+ON CONFLICT(reaction_id, source_path, row_ordinal) DO UPDATE SET
+  pH = excluded.pH,
+  temperature_C = excluded.temperature_C,
+  rate_value = excluded.rate_value,
+  rate_value_num = excluded.rate_value_num,
+  rate_units = excluded.rate_units,
+  method = excluded.method,
+  conditions = excluded.conditions,
+  reference_id = excluded.reference_id,
+  references_raw = excluded.references_raw,
+  page_info = excluded.page_info,
+  updated_at = datetime('now')
+"""
+
+
+def add_measurements_bulk(con: sqlite3.Connection, rows: list[tuple[Any, ...]]) -> int:
+    """Insert many measurements with one prepared statement.
+
+    Each row follows the INSERT_MEASUREMENT_SQL column order:
+    (reaction_id, pH, temperature_C, rate_value, rate_value_num, rate_units,
+     method, conditions, reference_id, references_raw, source_path, page_info).
+    Returns the number of rows inserted.
+    """
+    if not rows:
+        return 0
+    step = _MEASUREMENT_ROWS_PER_INSERT
+    n_full = len(rows) - len(rows) % step
+    for i in range(0, n_full, step):
+        con.execute(_MULTI_INSERT_MEASUREMENT_SQL, list(chain.from_iterable(rows[i : i + step])))
+    if n_full < len(rows):
+        con.executemany(INSERT_MEASUREMENT_SQL, rows[n_full:])
+    return len(rows)
+
+
+PRUNE_MEASUREMENTS_SQL = (
+    "DELETE FROM measurements WHERE reaction_id = ? "
+    "AND (source_path IS NOT ? OR row_ordinal IS NULL OR row_ordinal >= ?)"
+)
+
+
+def replace_measurements_for_source(
+    con: sqlite3.Connection,
+    reaction_id: int,
+    source_path: str,
+    rows: list[tuple[Any, ...]],
+    *,
+    deferred_prune: dict[int, tuple[str, int]] | None = None,
+) -> int:
+    """Make rows the complete measurement set of a reaction, updating rows in place.
+
+    Each row follows INSERT_MEASUREMENT_SQL order with row_ordinal (0..n-1) appended. Rows
+    are upserted on (reaction_id, source_path, row_ordinal); any other measurement of the
+    reaction (other source path variants, legacy rows without ordinal, surplus ordinals)
+    is deleted. Returns the number of rows written.
+
+    With deferred_prune, the delete is recorded there instead (the latest source per
+    reaction wins) and applied later in one batch by prune_measurements_bulk.
+    """
+    if rows:
+        con.executemany(UPSERT_MEASUREMENT_SQL, rows)
+    if deferred_prune is not None:
+        deferred_prune[reaction_id] = (source_path, len(rows))
+    else:
+        con.execute(PRUNE_MEASUREMENTS_SQL, (reaction_id, source_path, len(rows)))
+    return len(rows)
+
+
+def prune_measurements_bulk(
+    con: sqlite3.Connection, deferred_prune: dict[int, tuple[str, int]]
+) -> None:
+    """Apply and clear the deletes recorded by replace_measurements_for_source."""
+    if deferred_prune:
+        con.executemany(
+            PRUNE_MEASUREMENTS_SQL,
+            [(rid, src, n) for rid, (src, n) in deferred_prune.items()],
+        )
+        deferred_prune.clear()
+
+
 def search_reactions(
     con: sqlite3.Connection,
     query: str,
@@ -807,6 +1017,105 @@ def delete_reactions_by_source(
     return deleted
 
 
+def _count_by_canonical_source(
+    con: sqlite3.Connection, canonical_paths: list[str]
+) -> dict[str, int]:
+    """Reaction counts per exact canonical source_path (absent paths are omitted)."""
+    counts: dict[str, int] = {}
+    for i in range(0, len(canonical_paths), _IN_CHUNK):
+        chunk = canonical_paths[i : i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        for row in con.execute(
+            f"SELECT source_path, COUNT(*) FROM reactions WHERE source_path IN ({placeholders}) GROUP BY source_path",
+            chunk,
+        ):
+            counts[row[0]] = row[1]
+    return counts
+
+
+def set_validated_by_sources(
+    con: sqlite3.Connection,
+    items: list[tuple[str, str | None, str | None]],
+) -> dict[str, int]:
+    """Mark reactions validated for many (source_path, by, at_iso) items at once.
+
+    Issues one UPDATE ... WHERE source_path IN (...) per _IN_CHUNK paths of each distinct
+    (by, at_iso) pair; per-source counts come from one GROUP BY query run beforehand. Only
+    sources with no exact canonical match fall back to the filename suffix match of
+    set_validated_by_source. Does not commit: the caller commits, so the updates can share
+    its transaction. Returns a dict mapping source_path -> rows updated.
+    """
+    if not items:
+        return {}
+    groups: dict[tuple[str | None, str | None], list[str]] = {}
+    canon_of: dict[str, str] = {}
+    for source_path, by, at_iso in items:
+        canon = canonicalize_source_path(source_path)
+        canon_of[source_path] = canon
+        groups.setdefault((by, at_iso), []).append(canon)
+
+    counts = _count_by_canonical_source(con, list(set(canon_of.values())))
+    for (by, at_iso), canonical_paths in groups.items():
+        for i in range(0, len(canonical_paths), _IN_CHUNK):
+            chunk = canonical_paths[i : i + _IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            con.execute(
+                f"UPDATE reactions SET validated = 1, validated_by = ?, validated_at = ?, updated_at = datetime('now') WHERE source_path IN ({placeholders})",
+                (by, at_iso, *chunk),
+            )
+
+    result: dict[str, int] = {}
+    for source_path, by, at_iso in items:
+        updated = counts.get(canon_of[source_path], 0)
+        if updated == 0:
+            # Fallback: match by filename suffix to handle legacy absolute paths
+            cur = con.execute(
+                "UPDATE reactions SET validated = 1, validated_by = ?, validated_at = ?, updated_at = datetime('now') WHERE source_path LIKE '%' || ?",
+                (by, at_iso, Path(source_path).name),
+            )
+            updated = cur.rowcount
+        result[source_path] = updated
+    return result
+
+
+def delete_reactions_by_sources(con: sqlite3.Connection, source_paths: list[str]) -> dict[str, int]:
+    """Delete reactions (and cascading measurements) for many source paths at once.
+
+    Exact canonical matches are counted with one GROUP BY query and removed with one
+    DELETE ... WHERE source_path IN (...) per _IN_CHUNK paths; only sources without one fall
+    back to the filename suffix match of delete_reactions_by_source. Does not commit (the
+    caller commits). Returns a dict mapping source_path -> reaction rows deleted; rows are
+    attributed once even if two inputs share a canonical path.
+    """
+    if not source_paths:
+        return {}
+    canon_of = {p: canonicalize_source_path(p) for p in source_paths}
+    canonical_paths = list(set(canon_of.values()))
+    counts = _count_by_canonical_source(con, canonical_paths)
+    for i in range(0, len(canonical_paths), _IN_CHUNK):
+        chunk = canonical_paths[i : i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        con.execute(f"DELETE FROM reactions WHERE source_path IN ({placeholders})", chunk)
+
+    result: dict[str, int] = {}
+    seen: set[str] = set()
+    for source_path in source_paths:
+        canon = canon_of[source_path]
+        if canon in seen:
+            result.setdefault(source_path, 0)
+            continue
+        seen.add(canon)
+        deleted = counts.get(canon, 0)
+        if deleted == 0:
+            cur = con.execute(
+                "DELETE FROM reactions WHERE source_path LIKE '%' || ?",
+                (Path(source_path).name,),
+            )
+            deleted = cur.rowcount
+        result[source_path] = deleted
+    return result
+
+
 def list_reactions(
     con: sqlite3.Connection,
     *,
@@ -862,6 +1171,34 @@ def get_reaction_with_measurements(con: sqlite3.Connection, reaction_id: int) ->
     return {"reaction": r, "measurements": ms}
 
 
+def get_reactions_with_measurements(
+    con: sqlite3.Connection, reaction_ids: list[int]
+) -> dict[int, dict[str, Any]]:
+    """Bulk get_reaction_with_measurements: {id: {'reaction': row, 'measurements': rows}}.
+
+    Two queries per _IN_CHUNK ids instead of two per id; unknown ids are omitted.
+    """
+    ids = list(dict.fromkeys(reaction_ids))
+    result: dict[int, dict[str, Any]] = {}
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i : i + _IN_CHUNK]
+        placeholders = ",".join("?" * len(chunk))
+        for r in con.execute(f"SELECT * FROM reactions WHERE id IN ({placeholders})", chunk):
+            result[r["id"]] = {"reaction": r, "measurements": []}
+        for m in con.execute(
+            f"""
+            SELECT m.*, re.buxton_code, re.citation_text, re.doi, re.doi_status
+            FROM measurements m
+            LEFT JOIN references_map re ON m.reference_id = re.id
+            WHERE m.reaction_id IN ({placeholders})
+            ORDER BY m.id ASC
+            """,
+            chunk,
+        ):
+            result[m["reaction_id"]]["measurements"].append(m)
+    return result
+
+
 def get_validation_meta_by_source(con: sqlite3.Connection, source_path: str) -> dict[str, Any]:
     """Return validation/skip metadata for a given source path.
 
@@ -1151,30 +1488,33 @@ def get_validation_statistics(con: sqlite3.Connection) -> dict[str, Any]:
 
     Optimized version uses bulk queries to reduce database load.
     """
-    from config import AVAILABLE_TABLES, get_table_paths
 
-    def table_images(table_name):
-        img_dir, _, tsv_dir, _ = get_table_paths(table_name)
-        imgs = sorted([p.name for p in img_dir.glob("*.png")], key=natural_key)
-        return imgs, tsv_dir
+    def list_names(directory: Path, suffixes: tuple[str, ...]) -> set[str]:
+        # One directory listing instead of a stat() per image and candidate source
+        try:
+            with os.scandir(directory) as it:
+                return {e.name for e in it if e.name.endswith(suffixes)}
+        except OSError:
+            return set()
 
     # Collect all source files first
     all_source_paths = []
     table_source_mapping = {}
 
     for table_name in AVAILABLE_TABLES:
-        imgs, tsv_dir = table_images(table_name)
+        img_dir, _, tsv_dir, _ = get_table_paths(table_name)
+        imgs = sorted(list_names(img_dir, (".png",)), key=natural_key)
+        source_names = list_names(tsv_dir, (".csv", ".tsv"))
         table_sources = []
 
         for img in imgs:
-            stem = Path(img).stem
-            src_csv = tsv_dir / f"{stem}.csv"
-            src_tsv = tsv_dir / f"{stem}.tsv"
-            source_file = (
-                str(src_csv if src_csv.exists() else src_tsv)
-                if (src_csv.exists() or src_tsv.exists())
-                else None
-            )
+            stem = img[:-4]
+            if f"{stem}.csv" in source_names:
+                source_file: str | None = str(tsv_dir / f"{stem}.csv")
+            elif f"{stem}.tsv" in source_names:
+                source_file = str(tsv_dir / f"{stem}.tsv")
+            else:
+                source_file = None
             if source_file:
                 all_source_paths.append(source_file)
                 table_sources.append((img, source_file))
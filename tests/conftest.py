@@ -12,7 +12,7 @@ def data_env(tmp_path, monkeypatch):
 
     Returns a dict with:
       - base_dir: Path to temp data dir
-      - mods: dict of reloaded modules { 'config', 'reactions_db', 'import_reactions', 'tools_rebuild_db', 'fast_populate_db', 'pdf_utils', 'tsv_utils' }
+      - mods: dict of reloaded modules { 'config', 'reactions_db', 'import_reactions', 'bulk_import', 'tools_rebuild_db', 'fast_populate_db', 'pdf_utils', 'tsv_utils' }
     """
     base = tmp_path / "data"
     base.mkdir(parents=True, exist_ok=True)
@@ -31,6 +31,10 @@ def data_env(tmp_path, monkeypatch):
 
     importlib.reload(_imp)
 
+    import bulk_import as _bulk
+
+    importlib.reload(_bulk)
+
     import tools.rebuild_db as _rebuild
 
     importlib.reload(_rebuild)
@@ -53,6 +57,7 @@ def data_env(tmp_path, monkeypatch):
             "config": _config,
             "reactions_db": _rdb,
             "import_reactions": _imp,
+            "bulk_import": _bulk,
             "tools_rebuild_db": _rebuild,
             "fast_populate_db": _fast,
             "pdf_utils": _pdf,
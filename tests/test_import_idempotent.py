@@ -0,0 +1,137 @@
+import json
+from pathlib import Path
+
+
+def test_reimport_updates_measurements_in_place(data_env):
+    base = data_env["base_dir"]
+    mods = data_env["mods"]
+
+    from tests.conftest import make_table_with_item
+
+    item = make_table_with_item(base, "table5", "img001")
+    csv_path = item["csv"]
+    with open(csv_path, "a", encoding="utf-8") as fh:
+        fh.write("5-002\tSecond\tA -> B\t9\t1.0 x 10^8\tc\tBXT002\n")
+
+    imp = mods["import_reactions"]
+    assert imp.import_single_csv_idempotent(csv_path, 5) == (1, 2)
+
+    con = mods["reactions_db"].ensure_db()
+    try:
+        ids_before = [r[0] for r in con.execute("SELECT id FROM measurements ORDER BY id")]
+
+        # Same file again: rows are rewritten in place, not duplicated
+        assert imp.import_single_csv_idempotent(csv_path, 5) == (1, 2)
+        ids_after = [r[0] for r in con.execute("SELECT id FROM measurements ORDER BY id")]
+        assert ids_after == ids_before
+
+        # Shrunk file: surplus rows are removed
+        make_table_with_item(base, "table5", "img001", rate="2.0 x 10^9")
+        assert imp.import_single_csv_idempotent(csv_path, 5) == (1, 1)
+        rows = con.execute("SELECT id, rate_value_num, row_ordinal FROM measurements").fetchall()
+        assert [tuple(r) for r in rows] == [(ids_before[0], 2.0e9, 0)]
+    finally:
+        con.close()
+
+
+def test_reimport_table_prunes_surplus_rows_per_source(data_env):
+    base = data_env["base_dir"]
+    mods = data_env["mods"]
+
+    from tests.conftest import make_table_with_item
+
+    first = make_table_with_item(base, "table6", "img001")
+    make_table_with_item(base, "table6", "img002", buxton_no="6-002")
+    with open(first["csv"], "a", encoding="utf-8") as fh:
+        fh.write("6-001\tSecond\tA -> B\t9\t1.0 x 10^8\tc\tBXT002\n")
+
+    imp = mods["import_reactions"]
+    assert imp.reimport_table_all_sources(6)["measurements_imported"] == 3
+
+    # Shrink the first source; its surplus row goes, the other source is untouched
+    make_table_with_item(base, "table6", "img001")
+    assert imp.reimport_table_all_sources(6)["measurements_imported"] == 2
+    con = mods["reactions_db"].ensure_db()
+    try:
+        rows = con.execute(
+            "SELECT source_path, row_ordinal FROM measurements ORDER BY source_path"
+        ).fetchall()
+    finally:
+        con.close()
+    assert [(r[0].rsplit("/", 1)[-1], r[1]) for r in rows] == [("img001.csv", 0), ("img002.csv", 0)]
+
+
+def test_sync_rolls_back_only_the_failing_source(data_env, monkeypatch):
+    base = data_env["base_dir"]
+    mods = data_env["mods"]
+
+    from tests.conftest import make_table_with_item
+
+    for i, ref in ((1, "BXT001"), (2, "BXT009"), (3, "BXT009")):
+        item = make_table_with_item(base, "table7", f"img00{i}", buxton_no=f"7-00{i}", ref=ref)
+    item["db"].write_text(json.dumps({f"img00{i}.png": True for i in (1, 2, 3)}), encoding="utf-8")
+
+    imp = mods["import_reactions"]
+    real_replace = imp.replace_measurements_for_source
+
+    def failing_replace(con, rid, source_path, *args, **kwargs):
+        # Fails after the reaction and reference rows of img002 were written
+        if source_path.endswith("img002.csv"):
+            raise RuntimeError("boom")
+        return real_replace(con, rid, source_path, *args, **kwargs)
+
+    monkeypatch.setattr(imp, "replace_measurements_for_source", failing_replace)
+    summary = imp.sync_validations_to_db(table_numbers=(7,))
+
+    assert summary["imported_total"] == 2
+    assert [(i["issue"], Path(i["source_path"]).name) for i in summary["issues"]] == [
+        ("import_failed", "img002.csv")
+    ]
+    con = mods["reactions_db"].ensure_db()
+    try:
+        reactions = con.execute(
+            "SELECT png_path, source_path, validated FROM reactions ORDER BY png_path"
+        ).fetchall()
+        measurements = con.execute(
+            "SELECT m.source_path, m.references_raw, rm.id IS NOT NULL FROM measurements m "
+            "LEFT JOIN references_map rm ON rm.id = m.reference_id ORDER BY m.source_path"
+        ).fetchall()
+    finally:
+        con.close()
+    assert [(Path(r[0]).name, Path(r[1]).name, r[2]) for r in reactions] == [
+        ("img001.png", "img001.csv", 1),
+        ("img003.png", "img003.csv", 1),
+    ]
+    # img003 shares its reference cell with the rolled-back img002 and still links to a row
+    assert [(Path(m[0]).name, m[1], m[2]) for m in measurements] == [
+        ("img001.csv", "BXT001", 1),
+        ("img003.csv", "BXT009", 1),
+    ]
+
+
+def test_single_idempotent_import_rolls_back_a_failed_file(data_env, monkeypatch):
+    base = data_env["base_dir"]
+    mods = data_env["mods"]
+
+    from tests.conftest import make_table_with_item
+
+    item = make_table_with_item(base, "table5", "img001")
+    imp = mods["import_reactions"]
+    con = mods["reactions_db"].ensure_db()
+    try:
+        assert imp.import_single_csv_idempotent(item["csv"], 5, con) == (1, 1)
+        make_table_with_item(base, "table5", "img001", rate="2.0 x 10^9")
+        real_replace = imp.replace_measurements_for_source
+
+        def failing_replace(con, rid, source_path, rows, **kwargs):
+            # Rewrites the measurements, then fails
+            real_replace(con, rid, source_path, rows, **kwargs)
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(imp, "replace_measurements_for_source", failing_replace)
+        assert imp.import_single_csv_idempotent(item["csv"], 5, con) == (0, 0)
+        assert not con.in_transaction
+        rows = con.execute("SELECT rate_value, row_ordinal FROM measurements").fetchall()
+        assert [tuple(r) for r in rows] == [("5.5 x 10^9", 0)]
+    finally:
+        con.close()
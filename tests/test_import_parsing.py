@@ -1,4 +1,4 @@
-from import_reactions import parse_rate_value
+from import_reactions import parse_rate_value, parse_rate_values, parse_source_file
 
 
 def test_parse_rate_value_simple_float():
@@ -15,3 +15,34 @@ def test_parse_rate_value_times_ten_power_unicode():
 
 def test_parse_rate_value_invalid_returns_none():
     assert parse_rate_value("not_a_number") is None
+
+
+def test_parse_rate_value_non_finite_returns_none():
+    for raw in ("nan", " inf ", "-inf", "+inf", "+nan", "-nan", "1e999", "-1e999"):
+        assert parse_rate_value(raw) is None, raw
+    assert parse_rate_value("5 x 10^400") is None
+
+
+def test_parse_rate_value_fast_non_finite_returns_none():
+    from bulk_import import parse_rate_value_fast
+
+    for raw in ("nan", "inf", "-inf", "+inf", "+nan", "1e999", "-1e999", "5 x 10^400"):
+        assert parse_rate_value_fast(raw) is None, raw
+    assert parse_rate_value_fast("5.5 x 10^9") == 5.5e9
+
+
+def test_parse_rate_values_batch_matches_scalar():
+    values = ["5.5 x 10^9", None, "", "6.2 × 10^4", "5.5 x 10^9", "bad"]
+    assert parse_rate_values(values) == [5.5e9, None, None, 6.2e4, 5.5e9, None]
+
+
+def test_parse_source_file_skips_blank_rows(tmp_path):
+    src = tmp_path / "img1.csv"
+    src.write_text("\t\t\n8-1\tN\tA -> B\t7\t1.5\tc\tR1\n \t\t\t\t\t\t\n", encoding="utf-8")
+    meta, fields = parse_source_file(src)
+    assert meta == ("8-1", "N", "A -> B")
+    assert fields == [("7", "1.5", 1.5, "c", "R1")]
+
+    blank = tmp_path / "blank.csv"
+    blank.write_text("\t\t\t\n\n", encoding="utf-8")
+    assert parse_source_file(blank) is None
@@ -37,3 +37,31 @@ def test_list_and_search_reactions(data_env):
         assert any(h["id"] == rid for h in hits)
     finally:
         con.close()
+
+
+def test_get_reactions_with_measurements_matches_single_lookups(data_env):
+    base = data_env["base_dir"]
+    mods = data_env["mods"]
+    rdb = mods["reactions_db"]
+
+    from tests.conftest import make_table_with_item
+
+    make_table_with_item(base, "table6", "img001")
+    second = make_table_with_item(base, "table6", "img002", buxton_no="6-002")
+    with open(second["csv"], "a", encoding="utf-8") as fh:
+        fh.write("6-002\tSecond\tA -> B\t9\t1.0 x 10^8\tc\tBXT002\n")
+    assert mods["import_reactions"].reimport_table_all_sources(6)["measurements_imported"] == 3
+
+    con = rdb.ensure_db()
+    try:
+        ids = [r[0] for r in con.execute("SELECT id FROM reactions ORDER BY id")]
+        bulk = rdb.get_reactions_with_measurements(con, [*ids, 999])
+        assert sorted(bulk) == ids
+        for rid in ids:
+            single = rdb.get_reaction_with_measurements(con, rid)
+            assert dict(bulk[rid]["reaction"]) == dict(single["reaction"])
+            assert [dict(m) for m in bulk[rid]["measurements"]] == [
+                dict(m) for m in single["measurements"]
+            ]
+    finally:
+        con.close()
@@ -0,0 +1,21 @@
+import os
+
+from pdf_preview import iter_latex_pdfs
+
+
+def test_iter_latex_pdfs_matches_rglob(tmp_path):
+    for rel in [
+        "table5/csv/latex/a.pdf",
+        "table5/csv/latex/b.tex",
+        "table5/csv/latex/sub/deep.pdf",
+        "table6/csv/latex/c.pdf",
+        "table6/csv/other/d.pdf",
+        "latex/top.pdf",
+        "e.pdf",
+    ]:
+        p = tmp_path / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"%PDF")
+    os.symlink(tmp_path / "table5", tmp_path / "link5")
+
+    assert sorted(iter_latex_pdfs(tmp_path)) == sorted(tmp_path.rglob("latex/*.pdf"))
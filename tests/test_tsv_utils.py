@@ -1,4 +1,4 @@
-from tsv_utils import fix_radical_dots
+from tsv_utils import correct_tsv_file, fix_radical_dots, iter_tsv_rows
 
 
 def test_fix_radical_dots_replaces_cdot_with_bullet_outside_math():
@@ -11,3 +11,55 @@ def test_fix_radical_dots_does_not_change_inside_math():
     s = r"$CO_3^{\cdot-}$"
     out = fix_radical_dots(s)
     assert out == s
+
+
+def test_iter_tsv_rows_matches_csv_reader(tmp_path, monkeypatch):
+    import csv
+
+    import tsv_utils
+
+    plain = tmp_path / "plain.csv"
+    plain.write_bytes(b"a\tb\tc\r\n\t\tx -> y\nlast\n")
+    quoted = tmp_path / "quoted.csv"
+    quoted.write_text('q\t"in\ttab"\tz\n', encoding="utf-8")
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    blank_lines = tmp_path / "blank_lines.csv"
+    blank_lines.write_bytes(b"\na\tb\n\n\r\n\t\nlast")
+    cr_only = tmp_path / "cr_only.csv"
+    cr_only.write_bytes(b"a\tb\rc\r\rd\te\r")
+
+    for path in (plain, quoted, empty, blank_lines, cr_only):
+        with open(path, newline="", encoding="utf-8") as f:
+            expected = list(csv.reader(f, delimiter="\t"))
+        assert list(iter_tsv_rows(path)) == expected
+        # Memory-mapped path used for large files
+        monkeypatch.setattr(tsv_utils, "_WHOLE_READ_MAX", 0)
+        assert list(iter_tsv_rows(path)) == expected
+        monkeypatch.undo()
+
+
+def test_correct_tsv_file_from_text_matches_saved_file(tmp_path):
+    text = "8-1\tName\tA · B -> C\t7\t1.5 x 10^9 M-1 s-1\tc\r\n8-2\tShort\r\n"
+    saved = tmp_path / "saved.csv"
+    saved.write_bytes(text.encode("utf-8"))
+    from_file = correct_tsv_file(saved)
+
+    edited = tmp_path / "edited.csv"
+    edited.write_text("stale", encoding="utf-8")
+    assert correct_tsv_file(edited, text) == from_file
+    assert edited.read_bytes() == saved.read_bytes()
+
+
+def test_correct_tsv_file_keeps_edit_when_correction_fails(tmp_path):
+    import csv
+
+    import pytest
+
+    # A field over csv's size limit makes the reader raise
+    text = "8-1\t" + "x" * (csv.field_size_limit() + 1) + "\n"
+    edited = tmp_path / "edited.csv"
+    edited.write_text("stale", encoding="utf-8")
+    with pytest.raises(csv.Error):
+        correct_tsv_file(edited, text)
+    assert edited.read_text(encoding="utf-8") == text
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Import every TSV/CSV source of the selected tables into the reactions database.
+
+- Imports all .csv/.tsv sources idempotently (validated or not), refreshing reactions
+  and replacing their measurements.
+- Large tables are parsed in worker processes; the main process stays the only writer.
+- Use --bulk to skip per-commit fsyncs for a full reload.
+
+Usage (PowerShell):
+  python tools/import_csvs.py --tables 5 6 7 8 9
+  python tools/import_csvs.py --bulk
+
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from import_reactions import import_from_csvs
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Import all TSV/CSV sources into the DB.")
+    p.add_argument(
+        "--tables",
+        nargs="*",
+        type=int,
+        default=[5, 6, 7, 8, 9],
+        help="Table numbers to include (default: 5 6 7 8 9)",
+    )
+    p.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Skip per-commit fsyncs (faster for full reloads; rerun if interrupted by a crash)",
+    )
+    args = p.parse_args()
+
+    import_from_csvs(
+        table_numbers=tuple(args.tables or (5, 6, 7, 8, 9)),
+        bulk_mode=bool(args.bulk),
+        processes=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
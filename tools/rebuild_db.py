@@ -7,6 +7,7 @@ import time
 from pathlib import Path
 from typing import Any
 
+from bulk_import import _safe_remove_db_files
 from config import AVAILABLE_TABLES, get_table_paths
 from db_utils import load_db
 from import_reactions import import_single_csv_idempotent
@@ -21,31 +22,6 @@ CHUNK_SIZE = 50
 DB_FILE = DB_PATH
 
 
-def _safe_remove_db_files(db_path: Path, retries: int = 10, backoff_s: float = 0.2) -> None:
-    """Remove SQLite DB and sidecars with retries (Windows-friendly)."""
-    targets = [db_path, Path(str(db_path) + "-wal"), Path(str(db_path) + "-shm")]
-
-    def try_unlink(p: Path) -> None:
-        if not p.exists():
-            return
-        last_err: Exception | None = None
-        for i in range(retries):
-            try:
-                p.unlink()
-                return
-            except PermissionError as e:
-                last_err = e
-                time.sleep(backoff_s * (i + 1))
-            except Exception:
-                raise
-        raise PermissionError(
-            f"Could not remove '{p}'. Close any process using the database and retry."
-        ) from last_err
-
-    for t in targets:
-        try_unlink(t)
-
-
 def collect_sources(tables: list[str]) -> list[tuple[int, Path, dict[str, Any]]]:
     sources: list[tuple[int, Path, dict[str, Any]]] = []
     for t in tables:
@@ -199,7 +175,7 @@ def rebuild_db_from_validations(chunk_size: int = CHUNK_SIZE):
         batch_validated_updates = 0
         for tno, source, meta in batch:
             try:
-                rcount, _ = import_single_csv_idempotent(source, tno)
+                rcount, _ = import_single_csv_idempotent(source, tno, con)
                 batch_imported += rcount or 0
             except Exception as e:
                 print(f"[ERR][IMPORT] table={tno} source={source}: {e}")
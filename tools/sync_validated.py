@@ -54,10 +54,17 @@ def main() -> None:
         action="store_true",
         help="Scan and report issues without making DB changes",
     )
+    p.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Skip per-commit fsyncs (faster for large syncs; rerun if interrupted by a crash)",
+    )
     args = p.parse_args()
 
     tables = _parse_tables(args.tables)
-    summary = sync_validations_to_db(table_numbers=tables, dry_run=bool(args.dry_run))
+    summary = sync_validations_to_db(
+        table_numbers=tables, dry_run=bool(args.dry_run), bulk_mode=bool(args.bulk), processes=True
+    )
 
     print("=== Sync Summary ===")
     print(f"Tables: {summary['tables']}")
@@ -1,5 +1,58 @@
 import csv
+import io
+import mmap
+import os
 import re
+from collections.abc import Iterator
+from pathlib import Path
+
+# Sources up to this size are read and decoded in one call; larger ones are memory-mapped
+_WHOLE_READ_MAX = 1 << 20
+
+
+def iter_tsv_rows(source_path: Path) -> Iterator[list[str]]:
+    """Yield the tab-separated fields of each line in a source file.
+
+    Rows match csv.reader(delimiter="\t"): "\n", "\r\n" and bare "\r" end a line, and blank
+    lines yield []. Typical (small) sources are read and decoded whole, then split on newlines;
+    larger files are memory-mapped and decoded one line at a time. TSVs written by csv.writer
+    quote fields that contain '"', so files with a quote byte are handed to csv.reader instead
+    to keep its unquoting behaviour.
+    """
+    with open(source_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return  # mmap cannot map an empty file
+        if size <= _WHOLE_READ_MAX:
+            raw = f.read()
+            text = raw.decode("utf-8")
+            if b'"' in raw:
+                yield from csv.reader(io.StringIO(text, newline=""), delimiter="\t")
+                return
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            lines = text.split("\n")
+            if not lines[-1]:
+                lines.pop()  # trailing newline
+            for line in lines:
+                yield line.split("\t") if line else []
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data.find(b'"') != -1:
+                text = data[:].decode("utf-8")
+                yield from csv.reader(io.StringIO(text, newline=""), delimiter="\t")
+                return
+            for raw_line in iter(data.readline, b""):
+                line = raw_line.decode("utf-8").rstrip("\n")
+                if "\r" in line:
+                    # "\r\n" ending, or bare "\r" separators that readline does not split on
+                    parts = line.split("\r")
+                    if not parts[-1]:
+                        parts.pop()
+                    for part in parts:
+                        yield part.split("\t") if part else []
+                    continue
+                yield line.split("\t") if line else []
 
 
 def tsv_to_visible(tsv_text, tab_symbol="→"):
@@ -109,10 +162,21 @@ def sanitize_field(s):
     return " ".join(s.replace("\n", " ").replace("\r", " ").split())
 
 
-def correct_tsv_file(tsv_path):
+def correct_tsv_file(tsv_path, text: str | None = None):
+    """Correct a TSV in place and return the corrected text.
+
+    Pass text to correct unsaved content (e.g. an edit box) instead of re-reading tsv_path;
+    the corrected result is written once. If correcting it fails, the text is written as-is
+    before the error propagates, so the edit is not lost.
+    """
     rows = []
-    with open(tsv_path, encoding="utf-8") as f:
-        reader = csv.reader(f, delimiter="\t")
+    unsaved = text is not None
+    if text is None:
+        with open(tsv_path, encoding="utf-8") as f:
+            text = f.read()
+    try:
+        # newline=None: universal newlines, as when reading the file in text mode
+        reader = csv.reader(io.StringIO(text, newline=None), delimiter="\t")
         for row in reader:
             row = row + [""] * (7 - len(row))
             # Sanitize every field
@@ -124,6 +188,10 @@ def correct_tsv_file(tsv_path):
             row[5] = fix_radical_dots(row[5])
             row[5] = fix_units(row[5])
             rows.append(row)
+    except Exception:
+        if unsaved:
+            Path(tsv_path).write_text(text, encoding="utf-8")
+        raise
     with open(tsv_path, "w", encoding="utf-8", newline="") as f:
         writer = csv.writer(f, delimiter="\t", lineterminator="\n")
         writer.writerows(rows)
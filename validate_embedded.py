@@ -161,14 +161,13 @@ def show_validation_interface(current_user):
             st.sidebar.error("Cannot display DB path information")
 
     # Use optimized DB-backed statistics with short caching to avoid per-image queries
-    from reactions_db import DB_PATH as _DBP
-    from reactions_db import get_validation_statistics
+    from reactions_db import db_version_key, get_validation_statistics
 
-    @st.cache_data(ttl=30)
-    def _get_stats_cached(db_mtime: float) -> dict[str, Any]:
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _get_stats_cached(db_version: tuple[int, int, int, int]) -> dict[str, Any]:
         return get_validation_statistics(con)
 
-    stats = _get_stats_cached(_DBP.stat().st_mtime)
+    stats = _get_stats_cached(db_version_key())
     agg_total = stats["global"]["total_images"]
     agg_validated = stats["global"]["validated_images"]
     agg_percent = stats["global"]["validation_percentage"]
@@ -584,7 +583,7 @@ def show_validation_interface(current_user):
 
                             if debug_mode:
                                 st.sidebar.write(f"[DEBUG] Importing measurements from {csv_file}")
-                            rcount, mcount = import_single_csv_idempotent(csv_file, tno)
+                            rcount, mcount = import_single_csv_idempotent(csv_file, tno, con)
                             if debug_mode:
                                 st.sidebar.write(
                                     f"[DEBUG] Import result: reactions={rcount}, measurements={mcount}"
@@ -786,7 +785,7 @@ def show_validation_interface(current_user):
                                 st.sidebar.write(
                                     f"[DEBUG] Importing measurements from {csv_file} (pre-skip)"
                                 )
-                            rcount, mcount = import_single_csv_idempotent(csv_file, tno)
+                            rcount, mcount = import_single_csv_idempotent(csv_file, tno, con)
                             if debug_mode:
                                 st.sidebar.write(
                                     f"[DEBUG] Import result (pre-skip): reactions={rcount}, measurements={mcount}"
@@ -1219,10 +1218,9 @@ def show_validation_interface(current_user):
             )
 
             if st.button("Save and Recompile from TSV"):
-                # Write user edits as raw TSV, then apply correction and update text area
+                # Correct the user edits in memory, write them once and update the text area
                 edited_tsv = visible_to_tsv(edited_visible, tab_symbol=tab_symbol)
-                tsv_path.write_text(edited_tsv, encoding="utf-8")
-                corrected_tsv_text = correct_tsv_file(tsv_path)
+                corrected_tsv_text = correct_tsv_file(tsv_path, edited_tsv)
                 st.session_state[session_key] = tsv_to_visible(
                     corrected_tsv_text, tab_symbol=tab_symbol
                 )